@@ -1,18 +1,43 @@
 from __future__ import annotations
 
+import json
+import os
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 from typing import Any
 
 from agents import Agent, CodeInterpreterTool, FileSearchTool, ModelSettings, WebSearchTool
 from agents.models.multi_provider import MultiProvider
 from agents.tool import CodeInterpreter
+from openai import AsyncOpenAI
 from openai.types.shared import Reasoning
 
 from .models import TaskResult, VerifierResult
 
+# prompt path -> ((mtime_ns, size), stripped text)
+_PROMPT_CACHE: dict[str, tuple[tuple[int, int], str]] = {}
+# canonical provider config JSON -> shared provider (reuses its HTTP client)
+_PROVIDER_CACHE: dict[str, MultiProvider] = {}
+# (provider key, model name) -> resolved model, served without re-resolving
+_MODEL_CACHE: dict[tuple[str, str | None], Any] = {}
+# provider key -> raw OpenAI client for calls made outside the Agents SDK (Batch API)
+_CLIENT_CACHE: dict[str, AsyncOpenAI] = {}
+
 
 def _read_prompt(path: str | Path) -> str:
-    return Path(path).read_text().strip()
+    prompt_path = Path(path)
+    st = prompt_path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PROMPT_CACHE.get(str(prompt_path))
+    if cached and cached[0] == stamp:
+        return cached[1]
+    text = prompt_path.read_text().strip()
+    _PROMPT_CACHE[str(prompt_path)] = (stamp, text)
+    return text
+
+
+def invalidate_prompt(path: str | Path) -> None:
+    _PROMPT_CACHE.pop(str(Path(path)), None)
 
 
 def _code_interpreter_tool(config: dict[str, Any], agent_key: str) -> CodeInterpreterTool:
@@ -97,6 +122,17 @@ def _prompt_path(agent_key: str, config: dict[str, Any], prompts_dir: Path) -> P
     return default_dir / f"{agent_key}.md"
 
 
+def prompt_stamps(config: dict[str, Any], prompts_dir: Path) -> tuple[int, ...]:
+    # mtime_ns of every agent prompt (-1 if missing), to tell when built agents are stale.
+    stamps = []
+    for agent_key in _AGENT_SPECS:
+        try:
+            stamps.append(_prompt_path(agent_key, config, prompts_dir).stat().st_mtime_ns)
+        except FileNotFoundError:
+            stamps.append(-1)
+    return tuple(stamps)
+
+
 def _openai_provider_config(agent_key: str, config: dict[str, Any]) -> dict[str, Any]:
     providers_cfg = config.get("providers", {})
     default_openai = providers_cfg.get("default", {}).get("openai", {})
@@ -112,76 +148,119 @@ def _openai_provider_config(agent_key: str, config: dict[str, Any]) -> dict[str,
     return normalized
 
 
+def _provider_key(provider_cfg: dict[str, Any]) -> str:
+    # JSON rather than a tuple of items so list/dict values (e.g. headers) still key the cache.
+    return json.dumps(provider_cfg, sort_keys=True, default=str)
+
+
 def _model_for(agent_key: str, model_name: str | None, config: dict[str, Any]):
     provider_cfg = _openai_provider_config(agent_key, config)
-    provider = MultiProvider(
-        openai_api_key=provider_cfg.get("api_key"),
-        openai_base_url=provider_cfg.get("base_url"),
-        openai_organization=provider_cfg.get("organization"),
-        openai_project=provider_cfg.get("project"),
-        openai_use_responses=provider_cfg.get("use_responses"),
-    )
-    return provider.get_model(model_name)
+    key = _provider_key(provider_cfg)
+    provider = _PROVIDER_CACHE.get(key)
+    if provider is None:
+        provider = MultiProvider(
+            openai_api_key=provider_cfg.get("api_key"),
+            openai_base_url=provider_cfg.get("base_url"),
+            openai_organization=provider_cfg.get("organization"),
+            openai_project=provider_cfg.get("project"),
+            openai_use_responses=provider_cfg.get("use_responses"),
+        )
+        _PROVIDER_CACHE[key] = provider
+    model = _MODEL_CACHE.get((key, model_name))
+    if model is None:
+        model = provider.get_model(model_name)
+        _MODEL_CACHE[(key, model_name)] = model
+    return model
+
+
+def openai_client_for(agent_key: str, config: dict[str, Any]) -> AsyncOpenAI:
+    # Same resolved provider config as the agent's model, so base_url/api_key match.
+    provider_cfg = _openai_provider_config(agent_key, config)
+    key = _provider_key(provider_cfg)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=provider_cfg.get("api_key"),
+            base_url=provider_cfg.get("base_url"),
+            organization=provider_cfg.get("organization"),
+            project=provider_cfg.get("project"),
+        )
+        _CLIENT_CACHE[key] = client
+    return client
+
+
+def supports_prompt_cache_key(agent_key: str, config: dict[str, Any]) -> bool:
+    # prompt_cache_key is an OpenAI Responses parameter; chat-completions and
+    # OpenAI-compatible servers behind a custom base_url may reject it.
+    provider_cfg = _openai_provider_config(agent_key, config)
+    if provider_cfg.get("use_responses") is False:
+        return False
+    return not (provider_cfg.get("base_url") or os.getenv("OPENAI_BASE_URL"))
+
+
+def reset_provider_cache() -> None:
+    _PROVIDER_CACHE.clear()
+    _MODEL_CACHE.clear()
+    _CLIENT_CACHE.clear()
+
+
+_AGENT_SPECS: dict[str, tuple[str, type[TaskResult] | type[VerifierResult]]] = {
+    "literature_scout": ("LiteratureScout", TaskResult),
+    "paper_reader": ("PaperReader", TaskResult),
+    "derivation_coder": ("DerivationCoder", TaskResult),
+    "verifier": ("Verifier", VerifierResult),
+    "orchestrator": ("Orchestrator", TaskResult),
+}
 
 
-def build_agents(config: dict[str, Any], prompts_dir: Path) -> dict[str, Agent]:
+_AGENT_KEYS_BY_NAME = {name: agent_key for agent_key, (name, _) in _AGENT_SPECS.items()}
+
+
+def agent_key_for(agent: Agent) -> str | None:
+    return _AGENT_KEYS_BY_NAME.get(agent.name)
+
+
+def _build_agent(agent_key: str, config: dict[str, Any], prompts_dir: Path) -> Agent:
+    name, output_type = _AGENT_SPECS[agent_key]
     models = config.get("models", {})
     vector_store_id = config.get("vector_store_id") or ""
-    agents: dict[str, Agent] = {}
-    agents["literature_scout"] = Agent(
-        name="LiteratureScout",
-        instructions=_read_prompt(_prompt_path("literature_scout", config, prompts_dir)),
-        model=_model_for(
-            "literature_scout",
-            models.get("literature_scout", models.get("default")),
-            config,
-        ),
-        model_settings=_model_settings_for("literature_scout", config),
-        tools=_tools_for_agent("literature_scout", config, vector_store_id),
-        output_type=TaskResult,
-    )
-    agents["paper_reader"] = Agent(
-        name="PaperReader",
-        instructions=_read_prompt(_prompt_path("paper_reader", config, prompts_dir)),
-        model=_model_for(
-            "paper_reader",
-            models.get("paper_reader", models.get("default")),
-            config,
-        ),
-        model_settings=_model_settings_for("paper_reader", config),
-        tools=_tools_for_agent("paper_reader", config, vector_store_id),
-        output_type=TaskResult,
+    return Agent(
+        name=name,
+        instructions=_read_prompt(_prompt_path(agent_key, config, prompts_dir)),
+        model=_model_for(agent_key, models.get(agent_key, models.get("default")), config),
+        model_settings=_model_settings_for(agent_key, config),
+        tools=_tools_for_agent(agent_key, config, vector_store_id),
+        output_type=output_type,
     )
-    agents["derivation_coder"] = Agent(
-        name="DerivationCoder",
-        instructions=_read_prompt(_prompt_path("derivation_coder", config, prompts_dir)),
-        model=_model_for(
-            "derivation_coder",
-            models.get("derivation_coder", models.get("default")),
-            config,
-        ),
-        model_settings=_model_settings_for("derivation_coder", config),
-        tools=_tools_for_agent("derivation_coder", config, vector_store_id),
-        output_type=TaskResult,
-    )
-    agents["verifier"] = Agent(
-        name="Verifier",
-        instructions=_read_prompt(_prompt_path("verifier", config, prompts_dir)),
-        model=_model_for("verifier", models.get("verifier", models.get("default")), config),
-        model_settings=_model_settings_for("verifier", config),
-        tools=_tools_for_agent("verifier", config, vector_store_id),
-        output_type=VerifierResult,
-    )
-    agents["orchestrator"] = Agent(
-        name="Orchestrator",
-        instructions=_read_prompt(_prompt_path("orchestrator", config, prompts_dir)),
-        model=_model_for(
-            "orchestrator",
-            models.get("orchestrator", models.get("default")),
-            config,
-        ),
-        model_settings=_model_settings_for("orchestrator", config),
-        tools=_tools_for_agent("orchestrator", config, vector_store_id),
-        output_type=TaskResult,
-    )
-    return agents
+
+
+class AgentRegistry(Mapping[str, Agent]):
+    """Read-only agent mapping that builds each agent on first access."""
+
+    def __init__(self, config: dict[str, Any], prompts_dir: Path) -> None:
+        self.config = config
+        self.prompts_dir = prompts_dir
+        self._built: dict[str, Agent] = {}
+
+    def __getitem__(self, agent_key: str) -> Agent:
+        agent = self._built.get(agent_key)
+        if agent is None:
+            if agent_key not in _AGENT_SPECS:
+                raise KeyError(agent_key)
+            agent = _build_agent(agent_key, self.config, self.prompts_dir)
+            self._built[agent_key] = agent
+        return agent
+
+    def __contains__(self, agent_key: object) -> bool:
+        return agent_key in _AGENT_SPECS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_AGENT_SPECS)
+
+    def __len__(self) -> int:
+        return len(_AGENT_SPECS)
+
+
+def build_agents(config: dict[str, Any], prompts_dir: Path) -> AgentRegistry:
+    return AgentRegistry(config, prompts_dir)
+
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from agents import AgentOutputSchema, AgentOutputSchemaBase, ModelSettings
+from openai import AsyncOpenAI
+
+from .agents import agent_key_for, openai_client_for
+
+_TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+# Responses request field -> ModelSettings field, copied when set.
+_SETTINGS_FIELDS = (
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("truncation", "truncation"),
+    ("max_output_tokens", "max_tokens"),
+    ("store", "store"),
+    ("metadata", "metadata"),
+    ("prompt_cache_retention", "prompt_cache_retention"),
+)
+
+_Queued = tuple[str, Any, Any, ModelSettings, "asyncio.Future[Any]"]
+
+
+@dataclass
+class BatchRunResult:
+    final_output: Any
+
+    def final_output_as(self, cls: type) -> Any:
+        return self.final_output
+
+
+class BatchRunner:
+    """Runner stand-in that submits calls made together as Batch API jobs.
+
+    Calls are grouped by the OpenAI client built from each agent's resolved
+    provider config, one job per group, so agents on other credentials or base
+    URLs go to their own endpoint. Only single-turn calls are supported, so
+    agents with tools are rejected.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any],
+        client: AsyncOpenAI | None = None,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        completion_window: str = "24h",
+    ) -> None:
+        self.config = config
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.completion_window = completion_window
+        self._queue: list[_Queued] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._next_id = 0
+
+    async def run(self, agent: Any, input: Any, **kwargs: Any) -> BatchRunResult:
+        if agent.tools:
+            raise ValueError(f"{agent.name} uses tools and cannot run through the Batch API.")
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        run_config = kwargs.get("run_config")
+        # Same precedence as Runner: run-level settings override the agent's.
+        settings = agent.model_settings.resolve(getattr(run_config, "model_settings", None))
+        self._next_id += 1
+        self._queue.append((f"req-{self._next_id}", agent, input, settings, future))
+        if self._flush_task is None or self._flush_task.done():
+            # Yield once so sibling tasks started together land in the same batch.
+            self._flush_task = loop.create_task(self._flush_soon())
+        return BatchRunResult(await future)
+
+    async def _flush_soon(self) -> None:
+        await asyncio.sleep(0)
+        queued, self._queue = self._queue, []
+        try:
+            await self.run_batch(queued)
+        except Exception as exc:
+            for *_, future in queued:
+                if not future.done():
+                    future.set_exception(exc)
+
+    def _client_for(self, agent: Any) -> AsyncOpenAI:
+        if self.client is not None:
+            return self.client
+        agent_key = agent_key_for(agent)
+        if agent_key is None:
+            raise ValueError(f"No provider config for agent {agent.name}.")
+        return openai_client_for(agent_key, self.config)
+
+    def _request_line(
+        self, custom_id: str, agent: Any, input: Any, settings: ModelSettings
+    ) -> dict[str, Any]:
+        # Same strict schema and format the Responses model sends for Runner calls.
+        output_schema = _output_schema(agent)
+        text: dict[str, Any] = {
+            "format": {
+                "type": "json_schema",
+                "name": "final_output",
+                "schema": output_schema.json_schema(),
+                "strict": output_schema.is_strict_json_schema(),
+            }
+        }
+        if settings.verbosity is not None:
+            text["verbosity"] = settings.verbosity
+        body: dict[str, Any] = {
+            "model": getattr(agent.model, "model", agent.model),
+            "instructions": agent.instructions,
+            "input": input if isinstance(input, (str, list)) else json.dumps(input),
+            "text": text,
+            **_settings_body(settings),
+        }
+        return {"custom_id": custom_id, "method": "POST", "url": "/v1/responses", "body": body}
+
+    async def run_batch(self, queued: list[_Queued]) -> None:
+        groups: dict[int, tuple[AsyncOpenAI, list[_Queued]]] = {}
+        for item in queued:
+            client = self._client_for(item[1])
+            groups.setdefault(id(client), (client, []))[1].append(item)
+        await asyncio.gather(
+            *(self._run_group(client, items) for client, items in groups.values())
+        )
+
+    async def _run_group(self, client: AsyncOpenAI, queued: list[_Queued]) -> None:
+        try:
+            await self._submit(client, queued)
+        except Exception as exc:
+            for *_, future in queued:
+                if not future.done():
+                    future.set_exception(exc)
+
+    async def _submit(self, client: AsyncOpenAI, queued: list[_Queued]) -> None:
+        lines = [self._request_line(*item[:4]) for item in queued]
+        payload = "\n".join(json.dumps(line) for line in lines).encode("utf-8")
+        upload = await client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/responses",
+            completion_window=self.completion_window,
+        )
+        delay = self.poll_interval
+        while batch.status not in _TERMINAL_BATCH_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        results: dict[str, dict[str, Any]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for raw in content.text.splitlines():
+                if raw.strip():
+                    entry = json.loads(raw)
+                    results[entry["custom_id"]] = entry
+
+        for custom_id, agent, _, _, future in queued:
+            entry = results.get(custom_id)
+            try:
+                future.set_result(_parse_entry(entry, _output_schema(agent), batch.status))
+            except Exception as exc:
+                future.set_exception(exc)
+
+
+def _output_schema(agent: Any) -> AgentOutputSchemaBase:
+    # Resolved the way Runner resolves it, so both paths share one output contract.
+    if isinstance(agent.output_type, AgentOutputSchemaBase):
+        return agent.output_type
+    return AgentOutputSchema(agent.output_type)
+
+
+def _settings_body(settings: ModelSettings) -> dict[str, Any]:
+    # Mirrors how the Responses model maps ModelSettings onto responses.create;
+    # transport-only settings (headers, query, timeout, retry) don't apply here.
+    body: dict[str, Any] = {}
+    for key, name in _SETTINGS_FIELDS:
+        value = getattr(settings, name)
+        if value is not None:
+            body[key] = value
+    if settings.reasoning is not None:
+        body["reasoning"] = settings.reasoning.model_dump(exclude_none=True)
+    include = [str(getattr(item, "value", item)) for item in settings.response_include or []]
+    if settings.top_logprobs is not None:
+        body["top_logprobs"] = settings.top_logprobs
+        include.append("message.output_text.logprobs")
+    if include:
+        body["include"] = list(dict.fromkeys(include))
+    if isinstance(settings.extra_body, dict):
+        body.update(settings.extra_body)
+    body.update(settings.extra_args or {})
+    return body
+
+
+def _parse_entry(
+    entry: dict[str, Any] | None, output_schema: AgentOutputSchemaBase, batch_status: str
+) -> Any:
+    if entry is None:
+        raise RuntimeError(f"Batch {batch_status} without a result for this request.")
+    response = entry.get("response") or {}
+    if entry.get("error") or response.get("status_code") != 200:
+        raise RuntimeError(f"Batch request failed: {entry.get('error') or response.get('body')}")
+    for item in response.get("body", {}).get("output", []):
+        for part in item.get("content") or []:
+            if part.get("type") == "output_text":
+                return output_schema.validate_json(part["text"])
+    raise RuntimeError("Batch response has no output_text.")
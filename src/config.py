@@ -1,45 +1,198 @@
 from __future__ import annotations
 
+import copy
+import json
 import os
 import re
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _Dumper
+    from yaml import SafeLoader as _Loader
+
 ENV_PATTERN = re.compile(r"^\$\{([A-Z0-9_]+)\}$")
 
+_CONFIG_CACHE_MAX_ENTRIES = 100
+# resolved path -> (mtime, size, parsed config); env values are resolved per call.
+_CONFIG_CACHE: OrderedDict[str, tuple[float, int, dict[str, Any]]] = OrderedDict()
+
 
 def load_config(path: str | Path, *, resolve_env: bool = True) -> dict[str, Any]:
     config_path = Path(path)
     if not config_path.exists():
         raise FileNotFoundError(f"Config not found: {config_path}")
-    data = yaml.safe_load(config_path.read_text()) or {}
+    data = _parse_config(config_path)
+    # _parse_config hands back a private copy, so it can be resolved in place.
+    return _resolve_env_in_place(data) if resolve_env else data
+
+
+def _parse_config(config_path: Path) -> dict[str, Any]:
+    key = str(config_path.resolve())
+    stat = config_path.stat()
+    cached = _CONFIG_CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+    data = _read_config_file(config_path, stat)
+    _CONFIG_CACHE[key] = (stat.st_mtime, stat.st_size, data)
+    _CONFIG_CACHE.move_to_end(key)
+    while len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX_ENTRIES:
+        _CONFIG_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _config_cache_path(config_path: Path) -> Path:
+    return config_path.with_suffix(config_path.suffix + ".cache.json")
+
+
+def _read_config_file(config_path: Path, stat: os.stat_result) -> dict[str, Any]:
+    cache_path = _config_cache_path(config_path)
+    yaml_stamp = [stat.st_mtime_ns, stat.st_size]
+    try:
+        cached = _json_loads(cache_path.read_bytes())
+        sidecar_found = True
+    except FileNotFoundError:
+        cached = None
+        sidecar_found = False
+    except (OSError, ValueError):
+        cached = None
+        sidecar_found = True
+    # Trusted only for the exact YAML it was written from; mtime ordering alone
+    # misses a YAML restored with an older mtime (checkout, cp -p, rsync).
+    if (
+        isinstance(cached, dict)
+        and cached.get("yaml") == yaml_stamp
+        and isinstance(cached.get("config"), dict)
+    ):
+        return cached["config"]
+    data = yaml.load(config_path.read_text(), Loader=_Loader) or {}
     if not isinstance(data, dict):
         raise ValueError("Config must be a YAML mapping.")
-    return resolve_env_values(data) if resolve_env else data
+    if sidecar_found:
+        # Stale or unreadable sidecar: refresh it from the YAML we just parsed.
+        _write_config_cache(config_path, data, stat)
+    return data
+
+
+def _write_config_cache(
+    config_path: Path, config: dict[str, Any], stat: os.stat_result
+) -> None:
+    cache_path = _config_cache_path(config_path)
+    try:
+        payload = _json_dumps(
+            {"yaml": [stat.st_mtime_ns, stat.st_size], "config": config}
+        )
+        # Only keep the sidecar if JSON round-trips the YAML exactly (e.g. no
+        # non-string keys), otherwise the two sources would disagree.
+        exact = _json_loads(payload)["config"] == config
+    except (TypeError, ValueError):
+        exact = False
+    try:
+        if exact:
+            cache_path.write_bytes(payload)
+        else:
+            cache_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def invalidate_config(path: str | Path) -> None:
+    _CONFIG_CACHE.pop(str(Path(path).resolve()), None)
 
 
 def snapshot_config(config: dict[str, Any]) -> str:
-    return yaml.safe_dump(config, sort_keys=False).strip()
+    return yaml.dump(config, Dumper=_Dumper, sort_keys=False).strip()
 
 
 def save_config(path: str | Path, config: dict[str, Any]) -> None:
     config_path = Path(path)
     config_path.write_text(snapshot_config(config) + "\n")
+    _write_config_cache(config_path, config, config_path.stat())
+    invalidate_config(config_path)
+
+
+@contextmanager
+def edit_config(path: str | Path) -> Iterator[dict[str, Any]]:
+    config = load_config(path, resolve_env=False)
+    yield config
+    save_config(path, config)
+
+
+def _resolve_env_string(value: str) -> str:
+    if "${" not in value:
+        return value
+    match = ENV_PATTERN.match(value.strip())
+    if not match:
+        return value
+    env_key = match.group(1)
+    env_value = os.getenv(env_key)
+    if env_value is None:
+        raise ValueError(f"Missing required env var: {env_key}")
+    return env_value
+
+
+def env_var_names(value: Any) -> list[str]:
+    # Names of the ${ENV} placeholders resolve_env_values would substitute.
+    names: list[str] = []
+    pending = [value]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, str):
+            match = ENV_PATTERN.match(node.strip()) if "${" in node else None
+            if match:
+                names.append(match.group(1))
+        elif isinstance(node, dict):
+            pending.extend(node.values())
+        elif isinstance(node, list):
+            pending.extend(node)
+    return sorted(set(names))
 
 
 def resolve_env_values(value: Any) -> Any:
-    if isinstance(value, dict):
-        return {key: resolve_env_values(item) for key, item in value.items()}
-    if isinstance(value, list):
-        return [resolve_env_values(item) for item in value]
+    # Returns a new structure; the caller's dicts/lists are left untouched.
+    if isinstance(value, (dict, list)):
+        value = copy.deepcopy(value)
+    return _resolve_env_in_place(value)
+
+
+def _resolve_env_in_place(value: Any) -> Any:
     if isinstance(value, str):
-        match = ENV_PATTERN.match(value.strip())
-        if match:
-            env_key = match.group(1)
-            env_value = os.getenv(env_key)
-            if env_value is None:
-                raise ValueError(f"Missing required env var: {env_key}")
-            return env_value
+        return _resolve_env_string(value)
+    if not isinstance(value, (dict, list)):
+        return value
+    pending: list[dict[str, Any] | list[Any]] = [value]
+    while pending:
+        node = pending.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, item in items:
+            if isinstance(item, str):
+                node[key] = _resolve_env_string(item)
+            elif isinstance(item, (dict, list)):
+                pending.append(item)
     return value
@@ -1,32 +1,102 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import json
+import re
+import threading
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+try:
+    import ijson
+except ImportError:  # optional: fall back to a full json.loads
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
 from .paths import run_dir
-from .state_doc import extract_section
+from .state_doc import parse_state_doc
+
+# Per-run caches are LRU-bounded so a long-lived process doesn't keep every run it served.
+_MAX_CACHED_RUNS = 32
+# Snapshots are also built on prebuild worker threads.
+_CACHE_LOCK = threading.Lock()
+# run_id -> workspace-derived sections, frozen for the session so the pack
+# prefix stays byte-identical between turns.
+_SESSION_SNAPSHOT: OrderedDict[str, dict[str, str]] = OrderedDict()
+# (run_id, stage_id) -> (state doc text the pack was built from, pack)
+_PREBUILT_PACKS: OrderedDict[tuple[str, Any], tuple[str, str]] = OrderedDict()
+_LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def head_lines(text: str, max_lines: int) -> str | None:
+    # First max_lines lines (str.splitlines separators) joined by "\n", or None
+    # when text has no more lines than that; only the head is ever split.
+    cut = 0 if max_lines <= 0 else None
+    if cut is None:
+        for count, match in enumerate(_LINE_BREAK_RE.finditer(text), 1):
+            if count == max_lines:
+                cut = match.end()
+                break
+    if cut is None or cut >= len(text):
+        return None
+    return "\n".join(text[:cut].splitlines())
 
 
 def _truncate(text: str, max_lines: int = 200) -> str:
-    lines = text.splitlines()
-    if len(lines) <= max_lines:
+    head = head_lines(text, max_lines)
+    if head is None:
         return text.strip()
-    return "\n".join(lines[:max_lines]).strip() + "\n... (truncated)"
+    return head.strip() + "\n... (truncated)"
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _stream_papers(candidates: Path, limit: int) -> list[Any]:
+    # Parsing stops after `limit` entries, so only that prefix must be valid
+    # JSON; a file that breaks later still yields its first titles here, where
+    # the full json.loads fallback (no ijson) reports _invalid_json_.
+    with candidates.open("rb") as handle:
+        first = b""
+        while not first:
+            chunk = handle.read(256)
+            if not chunk:
+                break
+            first = chunk.lstrip()[:1]
+        handle.seek(0)
+        prefix = "papers.item" if first == b"{" else "item"
+        return list(islice(ijson.items(handle, prefix), limit))
 
 
 def _paper_pool_summary(run_id: str) -> str:
     candidates = run_dir(run_id) / "paper_candidates.json"
     if not candidates.exists():
         return "_none_"
-    try:
-        data = json.loads(candidates.read_text())
-    except json.JSONDecodeError:
-        return "_invalid_json_"
-    if isinstance(data, dict) and "papers" in data:
-        papers = data.get("papers", [])
-    else:
-        papers = data if isinstance(data, list) else []
+    papers: list[Any] | None = None
+    if ijson is not None:
+        try:
+            papers = _stream_papers(candidates, 5)
+        except ijson.JSONError:
+            papers = None
+    if papers is None:
+        try:
+            data = _json_loads(candidates.read_bytes())
+        except json.JSONDecodeError:
+            return "_invalid_json_"
+        if isinstance(data, dict) and "papers" in data:
+            papers = data.get("papers", [])
+        else:
+            papers = data if isinstance(data, list) else []
     lines = []
     for item in papers[:5]:
         if isinstance(item, dict):
@@ -39,41 +109,97 @@ def _paper_pool_summary(run_id: str) -> str:
 def _read_top_lines(path: Path, max_lines: int = 10) -> str:
     if not path.exists():
         return "_none_"
-    lines = [line.rstrip() for line in path.read_text().splitlines() if line.strip()]
+    lines: list[str] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for raw in handle:
+            # splitlines also breaks on separators file iteration keeps (\v, \u2028, ...).
+            for line in raw.splitlines():
+                if line.strip():
+                    lines.append(line.rstrip())
+            if len(lines) >= max_lines:
+                break
     if not lines:
         return "_none_"
     return "\n".join(lines[:max_lines])
 
 
+def _workspace_snapshot(run_id: str) -> dict[str, str]:
+    with _CACHE_LOCK:
+        snapshot = _SESSION_SNAPSHOT.get(run_id)
+        if snapshot is not None:
+            _SESSION_SNAPSHOT.move_to_end(run_id)
+            return snapshot
+    snapshot = {
+        "equations": _read_top_lines(run_dir(run_id) / "equation_bank.md", 10),
+        "assumptions": _read_top_lines(run_dir(run_id) / "assumptions.md", 10),
+        "papers": _paper_pool_summary(run_id),
+    }
+    with _CACHE_LOCK:
+        _SESSION_SNAPSHOT[run_id] = snapshot
+        while len(_SESSION_SNAPSHOT) > _MAX_CACHED_RUNS:
+            _SESSION_SNAPSHOT.popitem(last=False)
+    return snapshot
+
+
+def invalidate_snapshot(run_id: str) -> None:
+    with _CACHE_LOCK:
+        _SESSION_SNAPSHOT.pop(run_id, None)
+        for key in [key for key in _PREBUILT_PACKS if key[0] == run_id]:
+            _PREBUILT_PACKS.pop(key, None)
+
+
 def build_context_pack(
     run_id: str, state_doc_text: str, stage: dict[str, Any]
 ) -> str:
-    problem_spec = extract_section(state_doc_text, "Problem spec")
-    best_answer = extract_section(state_doc_text, "Current best answer")
-    verifier = extract_section(state_doc_text, "Verifier status")
-    lines = [
-        "# Context Pack",
-        "## Goal + constraints",
-        _truncate(problem_spec, 120),
-        "## Current stage",
-        f"Stage {stage.get('id')}: {stage.get('name')}",
-    ]
+    doc = parse_state_doc(state_doc_text)
+    problem_spec = doc.get_section("Problem spec")
+    best_answer = doc.get_section("Current best answer")
+    verifier = doc.get_section("Verifier status")
+    snapshot = _workspace_snapshot(run_id)
+    # Sections run from most to least stable so sibling calls and successive
+    # cycles share the longest possible prompt prefix (provider KV caches).
+    # Keep Verifier status and Current stage last; consumers parse by heading.
+    sections = (
+        ("Goal + constraints", _truncate(problem_spec, 120)),
+        ("Key equations", snapshot["equations"]),
+        ("Key assumptions", snapshot["assumptions"]),
+        ("Current best answer", _truncate(best_answer, 120)),
+        ("Paper pool summary", snapshot["papers"]),
+        ("Verifier status", _truncate(verifier, 40)),
+        ("Current stage", f"Stage {stage.get('id')}: {stage.get('name')}"),
+    )
+    buf = io.StringIO()
+    write = buf.write
+    write("# Context Pack\n")
+    for heading, body in sections:
+        write(f"## {heading}\n")
+        write(body)
+        write("\n")
     for task in stage.get("tasks", []):
-        lines.append(f"- {task.get('id')} {task.get('title')} ({task.get('status')})")
-    lines += [
-        "",
-        "## Current best answer",
-        _truncate(best_answer, 120),
-        "## Key equations",
-        _read_top_lines(run_dir(run_id) / "equation_bank.md", 10),
-        "## Key assumptions",
-        _read_top_lines(run_dir(run_id) / "assumptions.md", 10),
-        "## Verifier status",
-        _truncate(verifier, 40),
-        "## Paper pool summary",
-        _paper_pool_summary(run_id),
-    ]
-    return "\n".join(lines).strip() + "\n"
+        write(f"- {task.get('id')} {task.get('title')} ({task.get('status')})\n")
+    return buf.getvalue().strip() + "\n"
+
+
+async def prebuild_context_pack(
+    run_id: str, state_doc_text: str, predicted_stage: dict[str, Any]
+) -> None:
+    pack = await asyncio.to_thread(
+        build_context_pack, run_id, state_doc_text, predicted_stage
+    )
+    with _CACHE_LOCK:
+        _PREBUILT_PACKS[(run_id, predicted_stage.get("id"))] = (state_doc_text, pack)
+        while len(_PREBUILT_PACKS) > _MAX_CACHED_RUNS:
+            _PREBUILT_PACKS.popitem(last=False)
+
+
+def take_prebuilt_context_pack(
+    run_id: str, state_doc_text: str, stage: dict[str, Any]
+) -> str | None:
+    with _CACHE_LOCK:
+        entry = _PREBUILT_PACKS.pop((run_id, stage.get("id")), None)
+    if entry is None or entry[0] != state_doc_text:
+        return None
+    return entry[1]
 
 
 def write_context_pack(run_id: str, content: str) -> Path:
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import argparse
+import json
 from pathlib import Path
-from .config import load_config, save_config
-from .review import (
-    approve_task,
-    list_review_queue,
-    modify_task,
-    refresh_final_output,
-)
+from typing import Any, Callable
+
+# Config, review and agents modules are imported inside the handlers that need
+# them so light commands skip loading the Agents SDK / OpenAI client.
+
+_PARSER: argparse.ArgumentParser | None = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -69,6 +76,19 @@ def _build_parser() -> argparse.ArgumentParser:
     patch_parser.add_argument("--patch", required=True)
     patch_parser.add_argument("--mode", choices=["append", "replace"], default="append")
 
+    batch_parser = subparsers.add_parser(
+        "batch", help="Apply several config edits with one read and one write"
+    )
+    batch_parser.add_argument("--config", default="configs/agents.yaml")
+    batch_parser.add_argument(
+        "--ops",
+        required=True,
+        help=(
+            'Inline JSON list of edits, e.g. [{"command": "set-model", "agent": "verifier", '
+            '"model": "gpt-4.1"}], or a path to a JSON file containing one'
+        ),
+    )
+
     refresh_parser = subparsers.add_parser(
         "refresh-output", help="Regenerate final_output.md"
     )
@@ -82,15 +102,12 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _set_model(args: argparse.Namespace) -> None:
-    config = load_config(args.config, resolve_env=False)
+def _set_model(config: dict[str, Any], args: argparse.Namespace) -> None:
     config.setdefault("models", {})
     config["models"][args.agent] = args.model
-    save_config(args.config, config)
 
 
-def _set_provider(args: argparse.Namespace) -> None:
-    config = load_config(args.config, resolve_env=False)
+def _set_provider(config: dict[str, Any], args: argparse.Namespace) -> None:
     providers = config.setdefault("providers", {})
     target = providers.setdefault("per_agent", {})
     if args.agent == "default":
@@ -107,19 +124,15 @@ def _set_provider(args: argparse.Namespace) -> None:
         openai_cfg["project"] = args.project
     if args.use_responses is not None:
         openai_cfg["use_responses"] = args.use_responses == "true"
-    save_config(args.config, config)
 
 
-def _set_prompt(args: argparse.Namespace) -> None:
-    config = load_config(args.config, resolve_env=False)
+def _set_prompt(config: dict[str, Any], args: argparse.Namespace) -> None:
     prompts = config.setdefault("prompts", {})
     per_agent = prompts.setdefault("per_agent", {})
     per_agent[args.agent] = args.path
-    save_config(args.config, config)
 
 
-def _set_review(args: argparse.Namespace) -> None:
-    config = load_config(args.config, resolve_env=False)
+def _set_review(config: dict[str, Any], args: argparse.Namespace) -> None:
     review = config.setdefault("review", {})
     if getattr(args, "task", None):
         per_task = review.setdefault("per_task", {})
@@ -129,11 +142,9 @@ def _set_review(args: argparse.Namespace) -> None:
     else:
         per_agent = review.setdefault("per_agent", {})
         per_agent[args.agent] = args.policy
-    save_config(args.config, config)
 
 
-def _set_task_verify(args: argparse.Namespace) -> None:
-    config = load_config(args.config, resolve_env=False)
+def _set_task_verify(config: dict[str, Any], args: argparse.Namespace) -> None:
     verification = config.setdefault("task_verification", {})
     if args.task:
         per_task = verification.setdefault("per_task", {})
@@ -143,10 +154,52 @@ def _set_task_verify(args: argparse.Namespace) -> None:
         per_agent[args.agent] = args.policy
     else:
         verification["default"] = args.policy
-    save_config(args.config, config)
+
+
+_CONFIG_EDITORS: dict[str, Callable[[dict[str, Any], argparse.Namespace], None]] = {
+    "set-model": _set_model,
+    "set-provider": _set_provider,
+    "set-prompt": _set_prompt,
+    "set-review": _set_review,
+    "set-task-verify": _set_task_verify,
+}
+
+
+def _cli_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _apply_batch(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    from .config import edit_config
+
+    raw_ops = args.ops.strip()
+    ops = json.loads(raw_ops if raw_ops.startswith("[") else Path(args.ops).read_text())
+    if not isinstance(ops, list):
+        raise ValueError("Batch ops must be a JSON list")
+    parsed: list[tuple[str, argparse.Namespace]] = []
+    for op in ops:
+        op = dict(op)
+        command = op.pop("command", None)
+        if command not in _CONFIG_EDITORS:
+            raise ValueError(
+                f"Unsupported batch command: {command}. "
+                f"Supported: {', '.join(_CONFIG_EDITORS)}"
+            )
+        op.pop("config", None)
+        argv = [command]
+        for key, value in op.items():
+            argv += [f"--{key.replace('_', '-')}", _cli_value(value)]
+        parsed.append((command, parser.parse_args(argv)))
+    with edit_config(args.config) as config:
+        for command, op_args in parsed:
+            _CONFIG_EDITORS[command](config, op_args)
 
 
 def _apply_prompt_patch(args: argparse.Namespace) -> None:
+    from .config import load_config
+
     config = load_config(args.config, resolve_env=False)
     prompts = config.get("prompts", {})
     per_agent = prompts.get("per_agent", {})
@@ -155,27 +208,34 @@ def _apply_prompt_patch(args: argparse.Namespace) -> None:
     if not prompt_path.exists():
         raise FileNotFoundError(f"Prompt not found: {prompt_path}")
     patch_text = Path(args.patch).read_text()
+    existing_text = prompt_path.read_text()
     if args.mode == "replace":
         new_text = patch_text
+    elif not patch_text.strip():
+        new_text = existing_text
     else:
-        new_text = prompt_path.read_text().rstrip() + "\n\n" + patch_text.strip() + "\n"
+        new_text = existing_text.rstrip() + "\n\n" + patch_text.strip() + "\n"
+    # Leave the file (and its mtime, which keys the prompt caches) untouched
+    # when the patch is a no-op.
+    if new_text == existing_text:
+        return
+    # The new mtime/size is what invalidates the cached prompt in agents._read_prompt.
     prompt_path.write_text(new_text)
 
 
 def main() -> None:
-    parser = _build_parser()
+    parser = _get_parser()
     args = parser.parse_args()
-    if args.command == "set-model":
-        _set_model(args)
-    elif args.command == "set-provider":
-        _set_provider(args)
-    elif args.command == "set-prompt":
-        _set_prompt(args)
-    elif args.command == "set-review":
-        _set_review(args)
-    elif args.command == "set-task-verify":
-        _set_task_verify(args)
+    if args.command in _CONFIG_EDITORS:
+        from .config import edit_config
+
+        with edit_config(args.config) as config:
+            _CONFIG_EDITORS[args.command](config, args)
+    elif args.command == "batch":
+        _apply_batch(args, parser)
     elif args.command == "approve":
+        from .review import approve_task
+
         approve_task(args.run, args.task)
     elif args.command == "modify":
         summary = args.summary
@@ -187,6 +247,8 @@ def main() -> None:
                 raise ValueError("Artifact must be name=path")
             name, path = item.split("=", 1)
             artifact_map[name] = Path(path).read_text()
+        from .review import modify_task
+
         modify_task(
             args.run,
             args.task,
@@ -197,8 +259,12 @@ def main() -> None:
     elif args.command == "apply-prompt-patch":
         _apply_prompt_patch(args)
     elif args.command == "refresh-output":
+        from .review import refresh_final_output
+
         refresh_final_output(args.run)
     elif args.command == "review-queue":
+        from .review import list_review_queue
+
         items = list_review_queue(args.run)
         if not items:
             print("No tasks awaiting review.")
@@ -5,11 +5,17 @@ import asyncio
 import logging
 import sys
 
-from .config import load_config
-from .orchestrator import init_run, run_step, run_until_complete
-from .paths import run_dir
-from .state_doc import append_history, load_state_doc, touch_last_updated, write_state_doc
-from .tools_ingest import ingest_docs
+# Command dependencies (orchestrator -> Agents SDK/OpenAI, ingest -> OpenAI) are
+# imported inside the branches of _main_async that use them.
+
+_PARSER: argparse.ArgumentParser | None = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -42,8 +48,20 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _install_eager_task_factory() -> None:
+    # Eager tasks (Python 3.12+) run until their first real await inside
+    # create_task, so cache hits and short-circuits skip a loop round-trip.
+    # Set here, on the loop this CLI owns, never from library code.
+    factory = getattr(asyncio, "eager_task_factory", None)
+    if factory is not None:
+        asyncio.get_running_loop().set_task_factory(factory)
+
+
 async def _main_async(args: argparse.Namespace) -> None:
+    _install_eager_task_factory()
     if args.command == "init":
+        from .orchestrator import init_run
+
         if getattr(args, "question", None) is not None:
             question = sys.stdin.read().strip() if args.question == "-" else args.question
         else:
@@ -63,11 +81,15 @@ async def _main_async(args: argparse.Namespace) -> None:
         return
 
     if args.command == "step":
+        from .orchestrator import run_step
+
         outcome = await run_step(args.run, args.config)
         print(outcome)
         return
 
     if args.command == "run":
+        from .orchestrator import run_until_complete
+
         outcome = await run_until_complete(
             args.run, args.config, max_cycles=args.max_cycles
         )
@@ -77,20 +99,27 @@ async def _main_async(args: argparse.Namespace) -> None:
     if args.command == "ingest":
         if not args.docs:
             raise SystemExit("No docs provided.")
+        from .config import load_config
+        from .context_pack import invalidate_snapshot
+        from .paths import run_dir
+        from .state_doc import load_state_doc, parse_state_doc, write_state_doc
+        from .tools_ingest import ingest_docs
+
         config = load_config(args.config)
         ingest_docs(args.run, args.docs, config=config)
         state_doc_path = run_dir(args.run) / "RESEARCH_STATE.md"
-        state_doc = load_state_doc(state_doc_path)
-        updated = append_history(state_doc, f"ingested {len(args.docs)} docs")
-        updated = touch_last_updated(updated)
-        write_state_doc(state_doc_path, updated)
+        doc = parse_state_doc(load_state_doc(state_doc_path))
+        doc.append_history(f"ingested {len(args.docs)} docs")
+        invalidate_snapshot(args.run)
+        doc.touch_last_updated()
+        write_state_doc(state_doc_path, doc)
         print("ingested")
         return
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
-    parser = _build_parser()
+    parser = _get_parser()
     args = parser.parse_args()
     asyncio.run(_main_async(args))
 
@@ -1,40 +1,58 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import os
 import random
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Type
+from typing import Any, Coroutine, Type, TypeVar
 
-from agents import Runner
+from agents import ModelSettings, RunConfig, Runner
 
-from .agents import build_agents
-from .config import load_config, snapshot_config
-from .context_pack import build_context_pack, write_context_pack
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:  # optional: only needed for review.concurrency.rpm
+    AsyncLimiter = None
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic's serializer is used instead
+    orjson = None
+
+from .agents import build_agents, prompt_stamps, supports_prompt_cache_key
+from .batch_runner import BatchRunner
+from .config import env_var_names, load_config, resolve_env_values, snapshot_config
+from .context_pack import (
+    build_context_pack,
+    head_lines,
+    invalidate_snapshot,
+    prebuild_context_pack,
+    take_prebuilt_context_pack,
+    write_context_pack,
+)
 from .models import TaskResult, VerifierResult
 from .paths import db_path as metadata_db_path
-from .paths import run_dir, run_outputs_dir
+from .paths import run_dir, run_outputs_dir, run_status_path, write_bytes_fast
 from .state_doc import (
+    StateDocModel,
     append_history,
-    extract_section,
-    extract_task_graph_yaml,
-    extract_header_field,
     load_state_doc,
+    parse_state_doc,
     render_state_doc,
     render_final_output,
-    touch_last_updated,
-    update_current_best_answer,
-    update_evidence_ledger,
-    update_final_verifier,
-    update_results_ledger,
-    update_task_board,
-    update_task_graph,
-    update_verifier_status,
+    render_state_doc_from_model,
     write_state_doc,
 )
 from .storage import record_run
 from .task_graph import (
+    TaskGraphView,
     add_followup_tasks,
     current_stage,
     default_task_graph,
@@ -46,6 +64,36 @@ from .task_graph import (
 )
 from .tools_ingest import ingest_docs
 
+T = TypeVar("T")
+
+
+class _RunLock(asyncio.Lock):
+    # asyncio locks are bound to the loop that uses them.
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__()
+        self.loop = loop
+
+
+_FINAL_STAGE: dict[str, Any] = {"id": "final", "name": "final", "tasks": []}
+# Outcomes that depend only on the state doc, so an unchanged doc repeats them.
+_IDLE_STOP_REASONS = frozenset({"complete", "awaiting_human_review", "no_runnable_tasks"})
+# run_id -> background build of the context pack the next cycle will need
+_PREBUILD_TASKS: dict[str, asyncio.Task[None]] = {}
+# run_id -> lock; weak values, so a run's lock goes away once no step holds or awaits it
+_RUN_LOCKS: weakref.WeakValueDictionary[str, _RunLock] = weakref.WeakValueDictionary()
+# (config (mtime_ns, size), prompt mtime_ns values, referenced ${ENV} values)
+_AgentsStamp = tuple[
+    tuple[int, int], tuple[int, ...], tuple[tuple[str, str | None], ...]
+]
+# resolved config path -> (stamp, raw config with ${ENV} placeholders, agents)
+_AGENTS_CACHE: dict[str, tuple[_AgentsStamp, dict[str, Any], Mapping[str, Any]]] = {}
+_PROMPTS_DIR = Path("prompts")
+# run_id -> (loop, (max_llm, rpm), semaphore, limiter) bounding its LLM calls; LRU-bounded
+_LLM_LIMITS: OrderedDict[
+    str, tuple[asyncio.AbstractEventLoop, tuple[Any, Any], Any, Any]
+] = OrderedDict()
+_MAX_LLM_LIMIT_RUNS = 32
+
 @dataclass
 class StepOutcome:
     run_id: str
@@ -59,6 +107,51 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _schedule_context_pack_prebuild(
+    run_id: str, state_doc_text: str, stage: dict[str, Any]
+) -> None:
+    _PREBUILD_TASKS[run_id] = asyncio.create_task(
+        prebuild_context_pack(run_id, state_doc_text, stage)
+    )
+
+
+async def _context_pack_for(
+    run_id: str, state_doc_text: str, stage: dict[str, Any]
+) -> str:
+    pending = _PREBUILD_TASKS.pop(run_id, None)
+    if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+        try:
+            await pending
+        except Exception:
+            pass
+    prebuilt = take_prebuilt_context_pack(run_id, state_doc_text, stage)
+    if prebuilt is not None:
+        return prebuilt
+    return build_context_pack(run_id, state_doc_text, stage)
+
+
+class _GatherGroup:
+    """Minimal asyncio.TaskGroup stand-in for Python 3.10."""
+
+    def __init__(self) -> None:
+        self._tasks: list[asyncio.Task[Any]] = []
+
+    async def __aenter__(self) -> _GatherGroup:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def create_task(self, coro: Coroutine[Any, Any, T]) -> asyncio.Task[T]:
+        task = asyncio.ensure_future(coro)
+        self._tasks.append(task)
+        return task
+
+
+_task_group = getattr(asyncio, "TaskGroup", _GatherGroup)
+
+
 def _generate_run_id() -> str:
     stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     suffix = random.randint(1000, 9999)
@@ -66,7 +159,7 @@ def _generate_run_id() -> str:
 
 
 def _ensure_run_dirs(run_id: str) -> None:
-    run_dir(run_id).mkdir(parents=True, exist_ok=True)
+    # agent_outputs is the deepest run dir; parents=True creates the run dir too.
     run_outputs_dir(run_id).mkdir(parents=True, exist_ok=True)
 
 
@@ -106,50 +199,97 @@ async def _run_task(
     task: dict[str, Any],
     run_id: str,
     context_pack: str,
+    run_config: RunConfig | None = None,
 ) -> TaskResult:
     input_payload = {
         "task_id": task.get("id"),
         "task_title": task.get("title"),
         "acceptance_criteria": task.get("acceptance_criteria", []),
         "inputs": task.get("inputs", {}),
-        "context_pack": context_pack,
         "run_id": run_id,
     }
-    result = await runner.run(agent, input_payload)
+    result = await _run_llm(
+        runner,
+        agent,
+        _shared_prefix_input(context_pack, input_payload),
+        run_id,
+        run_config=run_config,
+    )
     return result.final_output_as(TaskResult)
 
 
-def _write_task_artifacts(run_id: str, output: TaskResult, task: dict[str, Any]) -> list[str]:
-    written: list[str] = []
-    outputs = task.get("outputs", [])
-    output_names: set[str] = set()
-    for entry in outputs:
-        for name in entry.get("artifacts", []):
-            output_names.add(name)
-    for name in output_names:
-        if name in output.artifacts:
-            dest = run_dir(run_id) / name
-            dest.write_text(output.artifacts[name])
-            written.append(name)
+def _shared_prefix_input(
+    context_pack: str, payload: dict[str, Any]
+) -> list[dict[str, str]]:
+    # The context pack goes first and verbatim so sibling calls in a stage share
+    # a byte-identical prefix the provider can serve from its prompt cache.
+    return [
+        {"role": "user", "content": context_pack},
+        # Graph inputs come from YAML, which can hold dates and other non-JSON scalars.
+        {"role": "user", "content": json.dumps(payload, default=str)},
+    ]
+
+
+def _prompt_cache_config(
+    run_id: str, stage_id: Any, agent_key: str, config: dict[str, Any]
+) -> RunConfig | None:
+    if not supports_prompt_cache_key(agent_key, config):
+        return None
+    return RunConfig(
+        model_settings=ModelSettings(
+            extra_args={"prompt_cache_key": f"{run_id}:{stage_id}"}
+        )
+    )
+
+
+async def _awrite_text(path: Path, text: str) -> None:
+    await asyncio.to_thread(write_bytes_fast, path, text.encode("utf-8"))
+
+
+def _task_output_json(output: TaskResult) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(output.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    return output.model_dump_json(indent=2).encode("utf-8")
+
+
+def _declared_artifact_names(task: dict[str, Any]) -> list[str]:
+    return list(
+        dict.fromkeys(
+            name
+            for entry in task.get("outputs", [])
+            for name in entry.get("artifacts", [])
+        )
+    )
+
+
+async def _write_task_artifacts(
+    run_id: str, output: TaskResult, artifact_names: list[str]
+) -> list[str]:
+    written = [name for name in artifact_names if name in output.artifacts]
+    await asyncio.gather(
+        *[
+            _awrite_text(run_dir(run_id) / name, output.artifacts[name])
+            for name in written
+        ]
+    )
     return written
 
 
 def _evidence_lines(output: TaskResult) -> list[str]:
-    lines: list[str] = []
-    for item in output.evidence:
-        note = item.note or ""
-        location = item.location or ""
-        lines.append(f"{item.source_id} | {location} | {note}".strip(" |"))
-    return lines
+    return [
+        f"{item.source_id} | {item.location or ''} | {item.note or ''}".strip(" |")
+        for item in output.evidence
+    ]
 
 
 def _truncate_text(text: str, max_lines: int = 120, max_chars: int = 6000) -> str:
     if not text:
         return ""
-    lines = text.splitlines()
-    if len(lines) > max_lines:
-        lines = lines[:max_lines] + ["... (truncated)"]
-    truncated = "\n".join(lines)
+    head = head_lines(text, max_lines)
+    if head is None:
+        truncated = "\n".join(text.splitlines())
+    else:
+        truncated = head + "\n... (truncated)"
     if len(truncated) > max_chars:
         truncated = truncated[:max_chars] + "\n... (truncated)"
     return truncated
@@ -183,17 +323,22 @@ def _task_verification_policy(task: dict[str, Any], config: dict[str, Any]) -> s
     return default_policy
 
 
-def _write_prompt_patches(run_id: str, task_id: str, output: TaskResult) -> list[str]:
+async def _write_prompt_patches(
+    run_id: str, task_id: str, output: TaskResult
+) -> list[str]:
+    patches = {
+        f"{task_id}_{name}": content
+        for name, content in output.artifacts.items()
+        if name.startswith("prompt_patch")
+    }
+    if not patches:
+        return []
     prompt_dir = run_dir(run_id) / "prompt_patches"
     prompt_dir.mkdir(parents=True, exist_ok=True)
-    written: list[str] = []
-    for name, content in output.artifacts.items():
-        if name.startswith("prompt_patch"):
-            dest_name = f"{task_id}_{name}"
-            dest = prompt_dir / dest_name
-            dest.write_text(content)
-            written.append(dest_name)
-    return written
+    await asyncio.gather(
+        *[_awrite_text(prompt_dir / name, content) for name, content in patches.items()]
+    )
+    return list(patches)
 
 
 async def _run_task_verifier(
@@ -203,14 +348,12 @@ async def _run_task_verifier(
     output: TaskResult,
     run_id: str,
     context_pack: str,
+    artifact_names: list[str],
+    run_config: RunConfig | None = None,
 ) -> VerifierResult:
-    output_names: set[str] = set()
-    for entry in task.get("outputs", []):
-        for name in entry.get("artifacts", []):
-            output_names.add(name)
     relevant_artifacts = {
         name: _truncate_text(output.artifacts.get(name, ""))
-        for name in sorted(output_names)
+        for name in sorted(artifact_names)
         if name in output.artifacts
     }
     payload = {
@@ -225,26 +368,92 @@ async def _run_task_verifier(
             "follow_ups": output.follow_ups,
             "metrics": output.metrics,
         },
-        "context_pack": context_pack,
         "run_id": run_id,
     }
-    result = await runner.run(verifier_agent, payload)
+    result = await _run_llm(
+        runner,
+        verifier_agent,
+        _shared_prefix_input(context_pack, payload),
+        run_id,
+        run_config=run_config,
+    )
     return result.final_output_as(VerifierResult)
 
 
-def _write_final_output(run_id: str, state_doc_text: str) -> None:
-    question = extract_header_field(state_doc_text, "question") or "_unknown_"
-    summary = extract_section(state_doc_text, "Current best answer")
-    final_report_path = run_dir(run_id) / "final_report.md"
-    if final_report_path.exists():
-        final_report = final_report_path.read_text()
-    else:
-        final_report = summary
+async def _run_task_with_verifier(
+    runner: Type[Runner],
+    agents: Mapping[str, Any],
+    task: dict[str, Any],
+    run_id: str,
+    context_pack: str,
+    config: dict[str, Any],
+    artifact_names: list[str],
+    task_runner: Any = None,
+    run_configs: Mapping[str, RunConfig | None] | None = None,
+) -> tuple[dict[str, Any], TaskResult | Exception, VerifierResult | None]:
+    run_configs = run_configs or {}
+    # Never raises: task errors are returned in place of the output so one
+    # failure doesn't cancel sibling tasks in the group.
+    try:
+        output = await _run_task(
+            task_runner or runner,
+            agents[task.get("agent")],
+            task,
+            run_id,
+            context_pack,
+            run_configs.get(task.get("agent")),
+        )
+    except Exception as exc:
+        return task, exc, None
+    if _task_verification_policy(task, config) != "llm":
+        return task, output, None
+    try:
+        verifier = await _run_task_verifier(
+            runner,
+            agents["verifier"],
+            task,
+            output,
+            run_id,
+            context_pack,
+            artifact_names,
+            run_configs.get("verifier"),
+        )
+    except Exception as exc:
+        verifier = VerifierResult(
+            verdict="FAIL",
+            summary=f"task verifier errored: {exc}",
+            issues=[str(exc)],
+            follow_ups=[],
+            prompt_patch=None,
+        )
+    return task, output, verifier
+
+
+def _write_final_output(
+    run_id: str,
+    state_doc_text: str | None = None,
+    *,
+    question: str | None = None,
+    summary: str | None = None,
+    final_report: str | None = None,
+) -> None:
+    if question is None or summary is None:
+        doc = parse_state_doc(state_doc_text)
+        if question is None:
+            question = doc.header_field("question") or "_unknown_"
+        if summary is None:
+            summary = doc.get_section("Current best answer")
+    if final_report is None:
+        final_report_path = run_dir(run_id) / "final_report.md"
+        if final_report_path.exists():
+            final_report = final_report_path.read_text()
+        else:
+            final_report = summary
     output_text = render_final_output(question, summary, final_report)
-    (run_dir(run_id) / "final_output.md").write_text(output_text)
+    write_bytes_fast(run_dir(run_id) / "final_output.md", output_text.encode("utf-8"))
 
 
-def _write_verifier_prompt_patch(
+async def _write_verifier_prompt_patch(
     run_id: str, label: str, output: VerifierResult
 ) -> str | None:
     if not output.prompt_patch:
@@ -252,7 +461,7 @@ def _write_verifier_prompt_patch(
     prompt_dir = run_dir(run_id) / "prompt_patches"
     prompt_dir.mkdir(parents=True, exist_ok=True)
     dest = prompt_dir / f"{label}_prompt_patch.md"
-    dest.write_text(output.prompt_patch)
+    await _awrite_text(dest, output.prompt_patch)
     return dest.name
 
 
@@ -267,21 +476,15 @@ def _default_agent_for_stage(stage_id: int | None) -> str:
 
 
 def _add_followup_placeholders(
-    doc_text: str, tasks: list[dict[str, Any]]
-) -> str:
-    updated = doc_text
-    for task in tasks:
-        updated = update_results_ledger(
-            updated,
-            task.get("id"),
-            task.get("title"),
-            "todo",
-            "_pending_",
-            [],
-            [],
-        )
-        updated = update_evidence_ledger(updated, task.get("id"), [])
-    return updated
+    doc: StateDocModel, tasks: list[dict[str, Any]]
+) -> None:
+    doc.update_results_ledger_many(
+        [
+            (task.get("id"), task.get("title"), "todo", "_pending_", [], [])
+            for task in tasks
+        ]
+    )
+    doc.update_evidence_ledger_many([(task.get("id"), []) for task in tasks])
 
 
 async def _run_stage_verifier(
@@ -290,6 +493,7 @@ async def _run_stage_verifier(
     stage: dict[str, Any],
     run_id: str,
     context_pack: str,
+    run_config: RunConfig | None = None,
 ) -> VerifierResult:
     task_summaries = {
         task.get("id"): {
@@ -303,72 +507,291 @@ async def _run_stage_verifier(
         "stage_name": stage.get("name"),
         "criteria": stage.get("verifier", {}).get("criteria", []),
         "tasks": task_summaries,
-        "context_pack": context_pack,
         "run_id": run_id,
     }
-    result = await runner.run(verifier_agent, payload)
+    result = await _run_llm(
+        runner,
+        verifier_agent,
+        _shared_prefix_input(context_pack, payload),
+        run_id,
+        run_config=run_config,
+    )
     return result.final_output_as(VerifierResult)
 
 
+def _config_stamp(config_path: str | Path) -> tuple[int, int]:
+    stat = Path(config_path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _env_stamp(env_names: Iterable[str]) -> tuple[tuple[str, str | None], ...]:
+    return tuple((name, os.environ.get(name)) for name in env_names)
+
+
+def _agents_stamp(
+    config_path: str | Path, config: dict[str, Any], env_names: Iterable[str]
+) -> _AgentsStamp:
+    return (
+        _config_stamp(config_path),
+        prompt_stamps(config, _PROMPTS_DIR),
+        _env_stamp(env_names),
+    )
+
+
+def _agents_stamp_current(
+    config_path: str | Path, config: dict[str, Any], stamp: _AgentsStamp
+) -> bool:
+    env_names = (name for name, _ in stamp[2])
+    return _agents_stamp(config_path, config, env_names) == stamp
+
+
+def _get_cached_agents(
+    config_path: str,
+) -> tuple[dict[str, Any], Mapping[str, Any], _AgentsStamp]:
+    # Agents are reused until the config, an agent prompt or an env value the
+    # config references changes. Env values are resolved on every call, outside
+    # the cache, so callers also get their own copy of the config to mutate.
+    path = Path(config_path).resolve()
+    config_stamp = _config_stamp(path)
+    cached = _AGENTS_CACHE.get(str(path))
+    if cached is not None and cached[0][0] == config_stamp:
+        raw_config = cached[1]
+    else:
+        raw_config = load_config(config_path, resolve_env=False)
+    config = resolve_env_values(raw_config)
+    stamp = (
+        config_stamp,
+        prompt_stamps(config, _PROMPTS_DIR),
+        _env_stamp(env_var_names(raw_config)),
+    )
+    if cached is not None and cached[0] == stamp:
+        return config, cached[2], stamp
+    agents = build_agents(resolve_env_values(raw_config), _PROMPTS_DIR)
+    _AGENTS_CACHE[str(path)] = (stamp, raw_config, agents)
+    return config, agents, stamp
+
+
+def _resolve_config_and_agents(
+    config_path: str,
+    config: dict[str, Any] | None,
+    agents: Mapping[str, Any] | None,
+) -> tuple[dict[str, Any], Mapping[str, Any]]:
+    if config is None and agents is None:
+        config, agents, _ = _get_cached_agents(config_path)
+        return config, agents
+    if config is None:
+        config = load_config(config_path)
+    if agents is None:
+        agents = build_agents(config, _PROMPTS_DIR)
+    return config, agents
+
+
+def _configure_llm_limits(run_id: str, config: dict[str, Any]) -> None:
+    concurrency = config.get("review", {}).get("concurrency") or {}
+    settings = (concurrency.get("max_llm"), concurrency.get("rpm"))
+    loop = asyncio.get_running_loop()
+    entry = _LLM_LIMITS.get(run_id)
+    if entry is not None and entry[0] is loop and entry[1] == settings:
+        _LLM_LIMITS.move_to_end(run_id)
+        return
+    max_llm, rpm = settings
+    if rpm and AsyncLimiter is None:
+        raise ValueError("review.concurrency.rpm requires the aiolimiter package.")
+    _LLM_LIMITS[run_id] = (
+        loop,
+        settings,
+        asyncio.Semaphore(int(max_llm)) if max_llm else None,
+        AsyncLimiter(float(rpm), 60) if rpm else None,
+    )
+    _LLM_LIMITS.move_to_end(run_id)
+    while len(_LLM_LIMITS) > _MAX_LLM_LIMIT_RUNS:
+        _LLM_LIMITS.popitem(last=False)
+
+
+async def _run_llm(
+    runner: Type[Runner], agent, payload: Any, run_id: str, **kwargs: Any
+) -> Any:
+    if isinstance(runner, BatchRunner):
+        # Batch jobs are rate-limited provider-side and may take hours; don't
+        # hold a live-call slot for them.
+        return await runner.run(agent, payload, **kwargs)
+    entry = _LLM_LIMITS.get(run_id)
+    semaphore, limiter = (entry[2], entry[3]) if entry else (None, None)
+    async with semaphore or nullcontext():
+        if limiter is not None:
+            await limiter.acquire()
+        return await runner.run(agent, payload, **kwargs)
+
+
+def _batch_runner_for(
+    batch_runner: BatchRunner | None, agents: Mapping[str, Any], task: dict[str, Any]
+) -> BatchRunner | None:
+    # Tool-using agents need the multi-turn Runner loop, so they stay interactive.
+    if batch_runner is None or not task.get("batchable"):
+        return None
+    if agents[task.get("agent")].tools:
+        return None
+    return batch_runner
+
+
+def _doc_fingerprint(state_doc_path: Path) -> list[Any]:
+    # The content hash catches edits that keep mtime_ns and size (coarse
+    # filesystem clocks, editors restoring mtime), which would otherwise
+    # leave a stale context pack behind the idle short-circuit.
+    stat = state_doc_path.stat()
+    digest = hashlib.sha256(state_doc_path.read_bytes()).hexdigest()
+    return [stat.st_mtime_ns, stat.st_size, digest]
+
+
+def _cached_idle_outcome(run_id: str, state_doc_path: Path) -> StepOutcome | None:
+    try:
+        status = json.loads(run_status_path(run_id).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+    if not isinstance(status, dict):
+        return None
+    if status.get("stop_reason") not in _IDLE_STOP_REASONS:
+        return None
+    if status.get("state_doc") != _doc_fingerprint(state_doc_path):
+        return None
+    return StepOutcome(run_id, status.get("stage_id"), [], None, status["stop_reason"])
+
+
+def _write_status(
+    run_id: str, state_doc_path: Path, outcome: StepOutcome
+) -> StepOutcome:
+    status = {
+        "stage_id": outcome.stage_id,
+        "stop_reason": outcome.stop_reason,
+        "state_doc": _doc_fingerprint(state_doc_path),
+    }
+    write_bytes_fast(run_status_path(run_id), json.dumps(status).encode("utf-8"))
+    return outcome
+
+
+def _run_lock(run_id: str) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _RUN_LOCKS.get(run_id)
+    if lock is None or lock.loop is not loop:
+        lock = _RunLock(loop)
+        _RUN_LOCKS[run_id] = lock
+    return lock
+
+
 async def run_step(
     run_id: str,
     config_path: str,
     runner: Type[Runner] = Runner,
+    *,
+    config: dict[str, Any] | None = None,
+    agents: Mapping[str, Any] | None = None,
+    prebuild_next: bool = False,
+) -> StepOutcome:
+    config, agents = _resolve_config_and_agents(config_path, config, agents)
+    # Steps for the same run read-modify-write one state doc; serialize them.
+    async with _run_lock(run_id):
+        return await _run_step(run_id, runner, config, agents, prebuild_next)
+
+
+async def _run_step(
+    run_id: str,
+    runner: Type[Runner],
+    config: dict[str, Any],
+    agents: Mapping[str, Any],
+    prebuild_next: bool = False,
 ) -> StepOutcome:
-    config = load_config(config_path)
-    prompts_dir = Path("prompts")
-    agents = build_agents(config, prompts_dir)
+    _configure_llm_limits(run_id, config)
     state_doc_path = run_dir(run_id) / "RESEARCH_STATE.md"
+    cached_outcome = _cached_idle_outcome(run_id, state_doc_path)
+    if cached_outcome is not None:
+        return cached_outcome
     state_doc_text = load_state_doc(state_doc_path)
+    doc = parse_state_doc(state_doc_text)
 
-    task_graph_yaml = extract_task_graph_yaml(state_doc_text)
-    graph = yaml_to_graph(task_graph_yaml)
+    graph = yaml_to_graph(doc.task_graph_yaml())
     validate_task_graph(graph)
+    # One id index for every task lookup this step makes.
+    view = TaskGraphView(graph)
 
     stage = current_stage(graph)
     if stage is None:
-        return StepOutcome(run_id, None, [], None, "complete")
+        return _write_status(
+            run_id, state_doc_path, StepOutcome(run_id, None, [], None, "complete")
+        )
 
     if any(
         task.get("status") == "blocked"
         and task.get("blocked_reason") == "awaiting_human_review"
         for task in stage.get("tasks", [])
     ):
-        return StepOutcome(run_id, stage.get("id"), [], None, "awaiting_human_review")
+        return _write_status(
+            run_id,
+            state_doc_path,
+            StepOutcome(run_id, stage.get("id"), [], None, "awaiting_human_review"),
+        )
 
-    context_pack = build_context_pack(run_id, state_doc_text, stage)
+    context_pack = await _context_pack_for(run_id, state_doc_text, stage)
     write_context_pack(run_id, context_pack)
 
-    runnable = runnable_tasks(graph, stage)
+    runnable = runnable_tasks(graph, stage, view)
     if not runnable:
-        return StepOutcome(run_id, stage.get("id"), [], None, "no_runnable_tasks")
+        return _write_status(
+            run_id,
+            state_doc_path,
+            StepOutcome(run_id, stage.get("id"), [], None, "no_runnable_tasks"),
+        )
 
+    # The doc is only written once, at the end of the step; the "running"
+    # statuses below live in memory and are overwritten before that write.
     for task in runnable:
-        set_task_status(graph, task.get("id"), "running")
-    updated_doc = update_task_graph(state_doc_text, graph)
-    updated_doc = update_task_board(updated_doc, graph)
-    updated_doc = touch_last_updated(updated_doc)
-    write_state_doc(state_doc_path, updated_doc)
-
-    results = await asyncio.gather(
-        *[
-            _run_task(runner, agents[task.get("agent")], task, run_id, context_pack)
-            for task in runnable
-        ],
-        return_exceptions=True,
-    )
+        set_task_status(graph, task.get("id"), "running", view=view)
 
-    updated_doc = load_state_doc(state_doc_path)
     verifier_blocked = False
+    best_answer_dirty = not (run_dir(run_id) / "final_output.md").exists()
+    final_report_text: str | None = None
     followup_tasks_added: list[dict[str, Any]] = []
-    tasks_run: list[str] = []
-    for task, output in zip(runnable, results):
+    tasks_run: list[str] = [task.get("id") for task in runnable]
+    artifact_names = {
+        task.get("id"): _declared_artifact_names(task) for task in runnable
+    }
+    run_configs = {
+        agent_key: _prompt_cache_config(run_id, stage.get("id"), agent_key, config)
+        for agent_key in agents
+    }
+    batch_runner: BatchRunner | None = None
+    if config.get("review", {}).get("use_batch_api"):
+        batch_runner = BatchRunner(config)
+    # Each task's verifier starts as soon as that task returns, inside the group.
+    async with _task_group() as group:
+        pending = [
+            group.create_task(
+                _run_task_with_verifier(
+                    runner,
+                    agents,
+                    task,
+                    run_id,
+                    context_pack,
+                    config,
+                    artifact_names[task.get("id")],
+                    _batch_runner_for(batch_runner, agents, task),
+                    run_configs,
+                )
+            )
+            for task in runnable
+        ]
+
+    # Results are applied after the group exits and in runnable order, so
+    # follow-up ids and ledger/history order don't depend on which call finished
+    # first, and a failing write can't cancel sibling calls still in flight.
+    results = [pending_task.result() for pending_task in pending]
+    for task, output, task_verifier in results:
         task_id = task.get("id")
-        tasks_run.append(task_id)
+        now = datetime.now(timezone.utc)
         if isinstance(output, Exception):
-            set_task_status(graph, task_id, "blocked", blocked_reason=str(output))
-            updated_doc = update_results_ledger(
-                updated_doc,
+            set_task_status(
+                graph, task_id, "blocked", view=view, blocked_reason=str(output)
+            )
+            doc.update_results_ledger(
                 task_id,
                 task.get("title"),
                 "blocked",
@@ -377,29 +800,18 @@ async def run_step(
                 [],
                 [str(output)],
             )
-            updated_doc = update_evidence_ledger(updated_doc, task_id, [])
-            updated_doc = append_history(updated_doc, f"{task_id} blocked: {output}")
+            doc.update_evidence_ledger(task_id, [])
+            doc.append_history(f"{task_id} blocked: {output}", now=now)
             continue
 
         policy = _review_policy(task, config)
-        verify_policy = _task_verification_policy(task, config)
-        written = _write_task_artifacts(run_id, output, task)
+        written = await _write_task_artifacts(
+            run_id, output, artifact_names[task_id]
+        )
+        if written:
+            invalidate_snapshot(run_id)
         evidence_lines = _evidence_lines(output)
-        prompt_patches = _write_prompt_patches(run_id, task_id, output)
-        task_verifier: VerifierResult | None = None
-        if verify_policy == "llm":
-            try:
-                task_verifier = await _run_task_verifier(
-                    runner, agents["verifier"], task, output, run_id, context_pack
-                )
-            except Exception as exc:
-                task_verifier = VerifierResult(
-                    verdict="FAIL",
-                    summary=f"task verifier errored: {exc}",
-                    issues=[str(exc)],
-                    follow_ups=[],
-                    prompt_patch=None,
-                )
+        prompt_patches = await _write_prompt_patches(run_id, task_id, output)
         issues: list[str] | None = None
         if task_verifier and task_verifier.verdict != "PASS":
             verifier_blocked = True
@@ -408,28 +820,31 @@ async def run_step(
                 follow_ups = [
                     f"Resolve task verifier verdict {task_verifier.verdict} for task {task_id}: {task_verifier.summary}"
                 ]
-            followup_tasks_added.extend(
-                add_followup_tasks(
-                    stage,
-                    follow_ups,
-                    _default_agent_for_stage(stage.get("id")),
-                )
+            new_tasks = add_followup_tasks(
+                stage,
+                follow_ups,
+                _default_agent_for_stage(stage.get("id")),
             )
+            view.add_tasks(stage, new_tasks)
+            followup_tasks_added.extend(new_tasks)
             issues = [f"task_verifier: {task_verifier.verdict}", *task_verifier.issues]
-            updated_doc = append_history(
-                updated_doc, f"{task_id} task verifier: {task_verifier.verdict}"
+            doc.append_history(
+                f"{task_id} task verifier: {task_verifier.verdict}", now=now
             )
 
         if policy == "human":
             set_task_status(
-                graph, task_id, "blocked", blocked_reason="awaiting_human_review"
+                graph,
+                task_id,
+                "blocked",
+                view=view,
+                blocked_reason="awaiting_human_review",
             )
             status = "blocked"
         else:
-            set_task_status(graph, task_id, "done")
+            set_task_status(graph, task_id, "done", view=view)
             status = "done"
-        updated_doc = update_results_ledger(
-            updated_doc,
+        doc.update_results_ledger(
             task_id,
             task.get("title"),
             status,
@@ -438,30 +853,34 @@ async def run_step(
             evidence_lines,
             issues,
         )
-        updated_doc = update_evidence_ledger(updated_doc, task_id, evidence_lines)
+        doc.update_evidence_ledger(task_id, evidence_lines)
         if prompt_patches:
-            updated_doc = append_history(
-                updated_doc, f"{task_id} prompt patches: {', '.join(prompt_patches)}"
+            doc.append_history(
+                f"{task_id} prompt patches: {', '.join(prompt_patches)}", now=now
             )
-        updated_doc = append_history(updated_doc, f"{task_id} {status}")
+        doc.append_history(f"{task_id} {status}", now=now)
 
         output_path = run_outputs_dir(run_id) / f"{task_id}.json"
-        output_path.write_text(output.model_dump_json(indent=2))
+        await asyncio.to_thread(
+            write_bytes_fast, output_path, _task_output_json(output)
+        )
 
         if "final_report.md" in written and output.artifacts.get("final_report.md"):
-            updated_doc = update_current_best_answer(
-                updated_doc, output.artifacts["final_report.md"]
-            )
+            doc.update_current_best_answer(output.artifacts["final_report.md"])
+        if "final_report.md" in written:
+            best_answer_dirty = True
+            final_report_text = output.artifacts["final_report.md"]
 
-    updated_doc = update_task_graph(updated_doc, graph)
-    updated_doc = update_task_board(updated_doc, graph)
+    now = datetime.now(timezone.utc)
+    doc.update_task_graph(graph)
+    doc.update_task_board(graph)
     if followup_tasks_added:
-        updated_doc = _add_followup_placeholders(updated_doc, followup_tasks_added)
-        updated_doc = append_history(
-            updated_doc,
+        _add_followup_placeholders(doc, followup_tasks_added)
+        doc.append_history(
             f"added follow-ups: {', '.join(t.get('id') for t in followup_tasks_added)}",
+            now=now,
         )
-    updated_doc = touch_last_updated(updated_doc)
+    doc.touch_last_updated(now)
 
     verifier_verdict: str | None = None
     stop_reason: str | None = None
@@ -474,27 +893,30 @@ async def run_step(
     if verifier_blocked and stop_reason is None:
         stop_reason = "verifier_blocked"
     if stage_complete(stage):
-        verifier_context_pack = build_context_pack(run_id, updated_doc, stage)
+        verifier_context_pack = build_context_pack(run_id, doc.render(), stage)
         verifier_output = await _run_stage_verifier(
-            runner, agents["verifier"], stage, run_id, verifier_context_pack
+            runner,
+            agents["verifier"],
+            stage,
+            run_id,
+            verifier_context_pack,
+            run_configs["verifier"],
         )
         verifier_verdict = verifier_output.verdict
-        patch_name = _write_verifier_prompt_patch(
+        now = datetime.now(timezone.utc)
+        patch_name = await _write_verifier_prompt_patch(
             run_id, f"stage_{stage.get('id')}_verifier", verifier_output
         )
         if patch_name:
-            updated_doc = append_history(
-                updated_doc, f"verifier prompt patch: {patch_name}"
-            )
-        updated_doc = update_verifier_status(
-            updated_doc,
+            doc.append_history(f"verifier prompt patch: {patch_name}", now=now)
+        doc.update_verifier_status(
             stage.get("id"),
             verifier_output.verdict,
             verifier_output.issues,
         )
-        updated_doc = append_history(
-            updated_doc,
+        doc.append_history(
             f"stage {stage.get('id')} verifier: {verifier_output.verdict}",
+            now=now,
         )
         if verifier_output.verdict != "PASS":
             follow_ups = verifier_output.follow_ups or verifier_output.issues
@@ -508,23 +930,41 @@ async def run_step(
                 _default_agent_for_stage(stage.get("id")),
             )
             if new_tasks:
-                updated_doc = update_task_graph(updated_doc, graph)
-                updated_doc = update_task_board(updated_doc, graph)
-                updated_doc = _add_followup_placeholders(updated_doc, new_tasks)
-                updated_doc = append_history(
-                    updated_doc,
+                doc.update_task_graph(graph)
+                doc.update_task_board(graph)
+                _add_followup_placeholders(doc, new_tasks)
+                doc.append_history(
                     f"added follow-ups: {', '.join(t.get('id') for t in new_tasks)}",
+                    now=now,
                 )
             stop_reason = "verifier_blocked"
+    updated_doc = render_state_doc_from_model(doc)
     write_state_doc(state_doc_path, updated_doc)
-    _write_final_output(run_id, updated_doc)
+    # Speculatively build the next cycle's pack from the doc we just wrote; it
+    # is only used if the next step starts from exactly this doc. Only worth it
+    # when the caller will run another step in this process.
+    if prebuild_next and stop_reason is None:
+        _schedule_context_pack_prebuild(
+            run_id, updated_doc, current_stage(graph) or _FINAL_STAGE
+        )
+    if best_answer_dirty:
+        _write_final_output(
+            run_id,
+            question=doc.header_field("question") or "_unknown_",
+            summary=doc.get_section("Current best answer"),
+            final_report=final_report_text,
+        )
 
-    return StepOutcome(
-        run_id=run_id,
-        stage_id=stage.get("id"),
-        tasks_run=tasks_run,
-        verifier_verdict=verifier_verdict,
-        stop_reason=stop_reason,
+    return _write_status(
+        run_id,
+        state_doc_path,
+        StepOutcome(
+            run_id=run_id,
+            stage_id=stage.get("id"),
+            tasks_run=tasks_run,
+            verifier_verdict=verifier_verdict,
+            stop_reason=stop_reason,
+        ),
     )
 
 
@@ -535,8 +975,20 @@ async def run_until_complete(
     runner: Type[Runner] = Runner,
 ) -> StepOutcome:
     last_outcome = StepOutcome(run_id, None, [], None, None)
-    for _ in range(max_cycles):
-        last_outcome = await run_step(run_id, config_path, runner=runner)
+    config, agents, stamp = _get_cached_agents(config_path)
+    for cycle in range(max_cycles):
+        # Only re-resolved when the config or a prompt changed on disk, so
+        # prompt patches applied mid-run take effect on the next cycle.
+        if cycle and not _agents_stamp_current(config_path, config, stamp):
+            config, agents, stamp = _get_cached_agents(config_path)
+        last_outcome = await run_step(
+            run_id,
+            config_path,
+            runner=runner,
+            config=config,
+            agents=agents,
+            prebuild_next=cycle + 1 < max_cycles,
+        )
         if last_outcome.stop_reason in {
             "complete",
             "verifier_blocked",
@@ -545,7 +997,11 @@ async def run_until_complete(
         }:
             break
     if last_outcome.stop_reason == "complete":
-        await run_final_verifier(run_id, config_path, runner=runner)
+        if not _agents_stamp_current(config_path, config, stamp):
+            config, agents, stamp = _get_cached_agents(config_path)
+        await run_final_verifier(
+            run_id, config_path, runner=runner, config=config, agents=agents
+        )
     return last_outcome
 
 
@@ -553,23 +1009,32 @@ async def run_final_verifier(
     run_id: str,
     config_path: str,
     runner: Type[Runner] = Runner,
+    *,
+    config: dict[str, Any] | None = None,
+    agents: Mapping[str, Any] | None = None,
 ) -> None:
-    config = load_config(config_path)
-    prompts_dir = Path("prompts")
-    agents = build_agents(config, prompts_dir)
+    config, agents = _resolve_config_and_agents(config_path, config, agents)
+    _configure_llm_limits(run_id, config)
     state_doc_path = run_dir(run_id) / "RESEARCH_STATE.md"
     state_doc_text = load_state_doc(state_doc_path)
     payload = {
         "run_id": run_id,
         "final_check": True,
-        "context_pack": build_context_pack(run_id, state_doc_text, {"id": "final", "name": "final", "tasks": []}),
+        "context_pack": await _context_pack_for(run_id, state_doc_text, _FINAL_STAGE),
     }
-    result = await runner.run(agents["verifier"], payload)
+    result = await _run_llm(runner, agents["verifier"], payload, run_id)
     final_output = result.final_output_as(VerifierResult)
-    updated_doc = update_final_verifier(state_doc_text, final_output.verdict)
-    patch_name = _write_verifier_prompt_patch(run_id, "final_verifier", final_output)
+    now = datetime.now(timezone.utc)
+    doc = parse_state_doc(state_doc_text)
+    doc.update_final_verifier(final_output.verdict)
+    patch_name = await _write_verifier_prompt_patch(run_id, "final_verifier", final_output)
     if patch_name:
-        updated_doc = append_history(updated_doc, f"verifier prompt patch: {patch_name}")
-    updated_doc = append_history(updated_doc, f"final verifier: {final_output.verdict}")
+        doc.append_history(f"verifier prompt patch: {patch_name}", now=now)
+    doc.append_history(f"final verifier: {final_output.verdict}", now=now)
+    updated_doc = render_state_doc_from_model(doc)
     write_state_doc(state_doc_path, updated_doc)
-    _write_final_output(run_id, updated_doc)
+    _write_final_output(
+        run_id,
+        question=doc.header_field("question") or "_unknown_",
+        summary=doc.get_section("Current best answer"),
+    )
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
+import functools
+import os
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=1)
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+@functools.lru_cache(maxsize=1)
 def artifacts_root() -> Path:
     return repo_root() / "artifacts"
 
 
+@functools.lru_cache(maxsize=1)
 def runs_root() -> Path:
     return artifacts_root() / "runs"
 
 
+@functools.lru_cache(maxsize=1)
 def papers_root() -> Path:
     return artifacts_root() / "papers"
 
@@ -27,5 +33,20 @@ def run_outputs_dir(run_id: str) -> Path:
     return run_dir(run_id) / "agent_outputs"
 
 
+def run_status_path(run_id: str) -> Path:
+    return run_dir(run_id) / "status.json"
+
+
+@functools.lru_cache(maxsize=1)
 def db_path() -> Path:
     return repo_root() / "db" / "metadata.sqlite"
+
+
+def write_bytes_fast(path: str | Path, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
@@ -1,69 +1,92 @@
 from __future__ import annotations
 
+import functools
 import re
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .context_pack import invalidate_snapshot
 from .models import TaskResult
-from .paths import run_dir, run_outputs_dir
+from .paths import run_dir, run_outputs_dir, run_status_path, write_bytes_fast
 from .state_doc import (
-    append_history,
-    extract_header_field,
-    extract_section,
+    StateDocModel,
     extract_task_graph_yaml,
     load_state_doc,
+    parse_state_doc,
     render_final_output,
-    touch_last_updated,
-    update_current_best_answer,
-    update_evidence_ledger,
-    update_results_ledger,
-    update_task_board,
-    update_task_graph,
     write_state_doc,
 )
 from .task_graph import find_task, set_task_status, validate_task_graph, yaml_to_graph
 
+_ISSUES_PATTERN = re.compile(r"^- issues:\n((?:  - .*\n?)*)", re.M)
+
+
+@functools.lru_cache(maxsize=256)
+def _task_block_pattern(task_id: str) -> re.Pattern[str]:
+    return re.compile(rf"^### {re.escape(task_id)}(?=[ \t]|$).*?(?=^### |\Z)", re.S | re.M)
+
+
+@functools.lru_cache(maxsize=256)
+def _load_task_result_cached(run_id: str, task_id: str, mtime: int) -> TaskResult:
+    output_path = run_outputs_dir(run_id) / f"{task_id}.json"
+    return TaskResult.model_validate_json(output_path.read_bytes())
+
 
 def _task_result_from_output(run_id: str, task_id: str) -> TaskResult | None:
     output_path = run_outputs_dir(run_id) / f"{task_id}.json"
-    if not output_path.exists():
+    try:
+        mtime = output_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
-    return TaskResult.model_validate_json(output_path.read_text())
+    # Cached per mtime: a rewritten output file gets a fresh entry.
+    return _load_task_result_cached(run_id, task_id, mtime)
 
 
 def _write_task_artifacts(run_id: str, output: TaskResult, artifacts: list[str]) -> None:
     run_path = run_dir(run_id)
     for name in artifacts:
         if name in output.artifacts:
-            (run_path / name).write_text(output.artifacts[name])
+            write_bytes_fast(run_path / name, output.artifacts[name].encode("utf-8"))
+    invalidate_snapshot(run_id)
 
 
 def _evidence_lines(output: TaskResult) -> list[str]:
-    lines: list[str] = []
-    for item in output.evidence:
-        note = item.note or ""
-        location = item.location or ""
-        lines.append(f"{item.source_id} | {location} | {note}".strip(" |"))
-    return lines
+    return [
+        f"{item.source_id} | {item.location or ''} | {item.note or ''}".strip(" |")
+        for item in output.evidence
+    ]
 
 
 def refresh_final_output(run_id: str) -> None:
     state_doc_path = run_dir(run_id) / "RESEARCH_STATE.md"
-    state_doc = load_state_doc(state_doc_path)
-    question = extract_header_field(state_doc, "question") or "_unknown_"
-    summary = extract_section(state_doc, "Current best answer")
+    final_output_path = run_dir(run_id) / "final_output.md"
     final_report_path = run_dir(run_id) / "final_report.md"
+    if final_output_path.exists() and final_report_path.exists():
+        # Nothing final_output.md is built from has changed since it was written.
+        # Without final_report.md we can't tell whether it was deleted, so rebuild.
+        output_mtime = final_output_path.stat().st_mtime_ns
+        if all(
+            output_mtime > path.stat().st_mtime_ns
+            for path in (state_doc_path, final_report_path)
+            if path.exists()
+        ):
+            return
+    doc = parse_state_doc(load_state_doc(state_doc_path))
+    question = doc.header_field("question") or "_unknown_"
+    summary = doc.get_section("Current best answer")
     final_report = final_report_path.read_text() if final_report_path.exists() else summary
     output_text = render_final_output(question, summary, final_report)
-    (run_dir(run_id) / "final_output.md").write_text(output_text)
+    write_bytes_fast(final_output_path, output_text.encode("utf-8"))
 
 
 def record_human_review_awaitable(run_id: str, awaitable_id: str) -> None:
     state_doc_path = run_dir(run_id) / "RESEARCH_STATE.md"
-    state_doc = load_state_doc(state_doc_path)
-    state_doc = append_history(state_doc, f"awaiting human review: {awaitable_id}")
-    state_doc = touch_last_updated(state_doc)
-    write_state_doc(state_doc_path, state_doc)
+    doc = parse_state_doc(load_state_doc(state_doc_path))
+    now = datetime.now(timezone.utc)
+    doc.append_history(f"awaiting human review: {awaitable_id}", now)
+    doc.touch_last_updated(now)
+    write_state_doc(state_doc_path, doc)
 
 
 def list_review_queue(run_id: str) -> list[dict[str, Any]]:
@@ -86,17 +109,13 @@ def list_review_queue(run_id: str) -> list[dict[str, Any]]:
     return items
 
 
-def _existing_task_issues(state_doc: str, task_id: str) -> list[str]:
-    ledger = extract_section(state_doc, "Results ledger")
-    block_match = re.search(
-        rf"^### {re.escape(task_id)}\\b.*?(?=^### |\\Z)",
-        ledger,
-        re.S | re.M,
-    )
+def _existing_task_issues(doc: StateDocModel, task_id: str) -> list[str]:
+    ledger = doc.get_section("Results ledger")
+    block_match = _task_block_pattern(task_id).search(ledger)
     if not block_match:
         return []
     block = block_match.group(0)
-    issues_match = re.search(r"^- issues:\n((?:  - .*\n?)*)", block, re.M)
+    issues_match = _ISSUES_PATTERN.search(block)
     if not issues_match:
         return []
     issues: list[str] = []
@@ -109,13 +128,13 @@ def _existing_task_issues(state_doc: str, task_id: str) -> list[str]:
 
 def approve_task(run_id: str, task_id: str) -> None:
     state_doc_path = run_dir(run_id) / "RESEARCH_STATE.md"
-    state_doc = load_state_doc(state_doc_path)
-    graph = yaml_to_graph(extract_task_graph_yaml(state_doc))
+    doc = parse_state_doc(load_state_doc(state_doc_path))
+    graph = yaml_to_graph(doc.task_graph_yaml())
     validate_task_graph(graph)
     task = find_task(graph, task_id)
     if task is None:
         raise ValueError(f"Unknown task id: {task_id}")
-    issues = _existing_task_issues(state_doc, task_id)
+    issues = _existing_task_issues(doc, task_id)
 
     output = _task_result_from_output(run_id, task_id)
     summary = output.summary if output else "_approved_"
@@ -125,10 +144,9 @@ def approve_task(run_id: str, task_id: str) -> None:
         _write_task_artifacts(run_id, output, artifacts)
 
     set_task_status(graph, task_id, "done")
-    state_doc = update_task_graph(state_doc, graph)
-    state_doc = update_task_board(state_doc, graph)
-    state_doc = update_results_ledger(
-        state_doc,
+    doc.update_task_graph(graph)
+    doc.update_task_board(graph)
+    doc.update_results_ledger(
         task_id,
         task.get("title"),
         "done",
@@ -137,10 +155,12 @@ def approve_task(run_id: str, task_id: str) -> None:
         evidence,
         issues or None,
     )
-    state_doc = update_evidence_ledger(state_doc, task_id, evidence)
-    state_doc = append_history(state_doc, f"{task_id} approved")
-    state_doc = touch_last_updated(state_doc)
-    write_state_doc(state_doc_path, state_doc)
+    doc.update_evidence_ledger(task_id, evidence)
+    now = datetime.now(timezone.utc)
+    doc.append_history(f"{task_id} approved", now)
+    doc.touch_last_updated(now)
+    write_state_doc(state_doc_path, doc)
+    run_status_path(run_id).unlink(missing_ok=True)
     refresh_final_output(run_id)
 
 
@@ -152,13 +172,13 @@ def modify_task(
     evidence: list[str] | None = None,
 ) -> None:
     state_doc_path = run_dir(run_id) / "RESEARCH_STATE.md"
-    state_doc = load_state_doc(state_doc_path)
-    graph = yaml_to_graph(extract_task_graph_yaml(state_doc))
+    doc = parse_state_doc(load_state_doc(state_doc_path))
+    graph = yaml_to_graph(doc.task_graph_yaml())
     validate_task_graph(graph)
     task = find_task(graph, task_id)
     if task is None:
         raise ValueError(f"Unknown task id: {task_id}")
-    issues = _existing_task_issues(state_doc, task_id)
+    issues = _existing_task_issues(doc, task_id)
 
     output = _task_result_from_output(run_id, task_id)
     resolved_summary = summary or (output.summary if output else "_modified_by_human_")
@@ -168,15 +188,15 @@ def modify_task(
         artifact_map = {**output.artifacts, **artifact_map}
 
     for name, content in artifact_map.items():
-        (run_dir(run_id) / name).write_text(content)
+        write_bytes_fast(run_dir(run_id) / name, content.encode("utf-8"))
+    invalidate_snapshot(run_id)
 
     resolved_evidence = evidence or (_evidence_lines(output) if output else [])
 
     set_task_status(graph, task_id, "done")
-    state_doc = update_task_graph(state_doc, graph)
-    state_doc = update_task_board(state_doc, graph)
-    state_doc = update_results_ledger(
-        state_doc,
+    doc.update_task_graph(graph)
+    doc.update_task_board(graph)
+    doc.update_results_ledger(
         task_id,
         task.get("title"),
         "done",
@@ -185,10 +205,12 @@ def modify_task(
         resolved_evidence,
         issues or None,
     )
-    state_doc = update_evidence_ledger(state_doc, task_id, resolved_evidence)
+    doc.update_evidence_ledger(task_id, resolved_evidence)
     if "final_report.md" in artifact_map:
-        state_doc = update_current_best_answer(state_doc, artifact_map["final_report.md"])
-    state_doc = append_history(state_doc, f"{task_id} modified")
-    state_doc = touch_last_updated(state_doc)
-    write_state_doc(state_doc_path, state_doc)
+        doc.update_current_best_answer(artifact_map["final_report.md"])
+    now = datetime.now(timezone.utc)
+    doc.append_history(f"{task_id} modified", now)
+    doc.touch_last_updated(now)
+    write_state_doc(state_doc_path, doc)
+    run_status_path(run_id).unlink(missing_ok=True)
     refresh_final_output(run_id)
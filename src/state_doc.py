@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .paths import write_bytes_fast
 from .task_graph import graph_to_yaml
 
 SECTION_TITLES = [
@@ -18,18 +20,34 @@ SECTION_TITLES = [
     "Verifier status",
     "History log",
 ]
+_HISTORY_TITLE = "History log"
 SECTION_BOUNDARY_PATTERN = "|".join(re.escape(title) for title in SECTION_TITLES)
+_SECTION_TITLE_SET = frozenset(SECTION_TITLES)
+_FENCE_RE = re.compile(r"^(`{3,})")
+_BACKTICK_RUN_RE = re.compile(r"`+")
+_YAML_BLOCK_RE = re.compile(r"```yaml\n(.*?)\n```", re.S)
+_AWAITING_RE = re.compile(r"awaiting human review: (\S+)")
+_TERMINAL_STATUSES = frozenset({"done", "skipped"})
+
+
+def _compile_section_re(title: str) -> re.Pattern[str]:
+    return re.compile(
+        rf"(^## {re.escape(title)}\n)(.*?)(?=^## (?:{SECTION_BOUNDARY_PATTERN})\n|\Z)",
+        re.S | re.M,
+    )
+
 
+_SUBSECTION_SPLIT_RE = re.compile(r"^(?=### )", re.M)
 
-def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+
+def _now_iso(now: datetime | None = None) -> str:
+    return (now or datetime.now(timezone.utc)).isoformat()
 
 
 def _choose_fence(text: str, char: str = "`", min_len: int = 3) -> str:
-    length = max(3, min_len)
-    while (char * length) in text:
-        length += 1
-    return char * length
+    run_re = _BACKTICK_RUN_RE if char == "`" else re.compile(f"(?:{re.escape(char)})+")
+    longest = max((len(run) for run in run_re.findall(text)), default=0)
+    return char * max(3, min_len, longest + 1)
 
 
 def render_task_board(graph: dict[str, Any]) -> str:
@@ -38,7 +56,7 @@ def render_task_board(graph: dict[str, Any]) -> str:
         lines.append(f"### Stage {stage.get('id')}: {stage.get('name')}")
         for task in stage.get("tasks", []):
             status = task.get("status", "todo")
-            box = "x" if status in {"done", "skipped"} else " "
+            box = "x" if status in _TERMINAL_STATUSES else " "
             lines.append(
                 f"- [{box}] {task.get('id')} {task.get('title')} ({status})"
             )
@@ -53,7 +71,7 @@ def _render_task_result_block(
     summary: str,
     artifacts: list[str] | None,
     evidence: list[str] | None,
-    issues: list[str] | None,
+    issues: list[str] | None = None,
 ) -> str:
     artifacts = artifacts or []
     evidence = evidence or []
@@ -65,17 +83,17 @@ def _render_task_result_block(
         "- artifacts:",
     ]
     if artifacts:
-        lines.extend([f"  - {name}" for name in artifacts])
+        lines.extend(f"  - {name}" for name in artifacts)
     else:
         lines.append("  - _none_")
     lines.append("- evidence:")
     if evidence:
-        lines.extend([f"  - {item}" for item in evidence])
+        lines.extend(f"  - {item}" for item in evidence)
     else:
         lines.append("  - _none_")
     if issues:
         lines.append("- issues:")
-        lines.extend([f"  - {item}" for item in issues])
+        lines.extend(f"  - {item}" for item in issues)
     return "\n".join(lines)
 
 
@@ -100,7 +118,7 @@ def render_results_ledger(graph: dict[str, Any]) -> str:
 def _render_evidence_block(task_id: str, entries: list[str]) -> str:
     lines = [f"### {task_id}", "- evidence:"]
     if entries:
-        lines.extend([f"  - {entry}" for entry in entries])
+        lines.extend(f"  - {entry}" for entry in entries)
     else:
         lines.append("  - _none_")
     return "\n".join(lines)
@@ -114,6 +132,30 @@ def render_evidence_ledger(graph: dict[str, Any]) -> str:
     return "\n\n".join(blocks).strip()
 
 
+def _render_all_ledgers(graph: dict[str, Any]) -> tuple[str, str, str]:
+    board: list[str] = []
+    results: list[str] = []
+    evidence: list[str] = []
+    for stage in graph.get("stages", []):
+        board.append(f"### Stage {stage.get('id')}: {stage.get('name')}")
+        for task in stage.get("tasks", []):
+            task_id = task.get("id")
+            title = task.get("title")
+            status = task.get("status", "todo")
+            box = "x" if status in _TERMINAL_STATUSES else " "
+            board.append(f"- [{box}] {task_id} {title} ({status})")
+            results.append(
+                _render_task_result_block(task_id, title, status, "_pending_", [], [], [])
+            )
+            evidence.append(_render_evidence_block(task_id, []))
+        board.append("")
+    return (
+        "\n".join(board).strip(),
+        "\n\n".join(results).strip(),
+        "\n\n".join(evidence).strip(),
+    )
+
+
 def render_state_doc(
     run_id: str,
     question: str,
@@ -126,13 +168,14 @@ def render_state_doc(
     question_text = question.rstrip("\n") or "_TBD_"
     question_lines = question_text.splitlines()
     question_fence = _choose_fence(question_text, "`")
+    task_board, results_ledger, evidence_ledger = _render_all_ledgers(task_graph)
     header_lines = [
         f"- run_id: {run_id}",
         f"- created_at: {created}",
         f"- last_updated: {created}",
         "- question:",
         f"  {question_fence}md",
-        *[f"  {line}" for line in question_lines],
+        *(f"  {line}" for line in question_lines),
         f"  {question_fence}",
         "- config_snapshot:",
         "```yaml",
@@ -144,9 +187,9 @@ def render_state_doc(
         f"## {SECTION_TITLES[1]}\n{problem_spec_text.strip()}",
         f"## {SECTION_TITLES[2]}\n_TBD_",
         f"## {SECTION_TITLES[3]}\n```yaml\n{task_graph_yaml}\n```",
-        f"## {SECTION_TITLES[4]}\n{render_task_board(task_graph)}",
-        f"## {SECTION_TITLES[5]}\n{render_results_ledger(task_graph)}",
-        f"## {SECTION_TITLES[6]}\n{render_evidence_ledger(task_graph)}",
+        f"## {SECTION_TITLES[4]}\n{task_board}",
+        f"## {SECTION_TITLES[5]}\n{results_ledger}",
+        f"## {SECTION_TITLES[6]}\n{evidence_ledger}",
         f"## {SECTION_TITLES[7]}\n- stage_verifier: not_run\n- final_verifier: not_run",
         f"## {SECTION_TITLES[8]}\n- {created}: init run",
     ]
@@ -154,36 +197,262 @@ def render_state_doc(
 
 
 def load_state_doc(path: str | Path) -> str:
-    return Path(path).read_text()
+    return Path(path).read_bytes().decode("utf-8")
 
 
-def write_state_doc(path: str | Path, content: str) -> None:
-    Path(path).write_text(content)
+def write_state_doc(path: str | Path, content: str | StateDocModel) -> None:
+    if isinstance(content, StateDocModel):
+        content = content.render()
+    write_bytes_fast(path, content.encode("utf-8"))
 
 
 def extract_section(text: str, title: str) -> str:
-    pattern = rf"^## {re.escape(title)}\n(.*?)(?=^## (?:{SECTION_BOUNDARY_PATTERN})\n|\Z)"
-    match = re.search(pattern, text, re.S | re.M)
+    if title in _SECTION_TITLE_SET:
+        return parse_state_doc(text).get_section(title)
+    # Titles outside SECTION_TITLES aren't split out by the parser.
+    match = _compile_section_re(title).search(text)
     if not match:
         raise ValueError(f"Section not found: {title}")
-    return match.group(1).strip()
+    return match.group(2).strip()
 
 
 def replace_section(text: str, title: str, new_body: str) -> str:
-    pattern = rf"(^## {re.escape(title)}\n)(.*?)(?=^## (?:{SECTION_BOUNDARY_PATTERN})\n|\Z)"
-    match = re.search(pattern, text, re.S | re.M)
-    if not match:
-        raise ValueError(f"Section not found: {title}")
-    start = match.group(1)
-    return text[: match.start(1)] + start + new_body.strip() + "\n\n" + text[match.end(2) :]
+    return _apply(text, StateDocModel.set_section, title, new_body)
+
+
+def _split_ledger(body: str) -> dict[str, str]:
+    # Keyed by the task id after "### "; text before the first block is kept under "".
+    blocks: dict[str, str] = {}
+    for idx, chunk in enumerate(_SUBSECTION_SPLIT_RE.split(body)):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        if chunk.startswith("### "):
+            heading = chunk[4:].split(None, 1)
+            key = heading[0] if heading else ""
+        else:
+            key = ""
+        if key in blocks:
+            # Only the first block per id is addressable; later duplicates ride along.
+            key = f"{key}\0{idx}"
+        blocks[key] = chunk
+    return blocks
+
+
+@dataclass
+class StateDocModel:
+    """State doc split into its ``## `` sections; render() reassembles it."""
+
+    preamble: str
+    titles: list[str]
+    bodies: list[str]
+    index: dict[str, int] = field(default_factory=dict)
+    # History log entries, split out on first append so appends don't rebuild
+    # the section string; joined back into bodies when read or rendered.
+    _history: list[str] | None = field(default=None, init=False, repr=False)
+    # Ledger sections split into task-id keyed blocks on first update, joined
+    # back the same way as history.
+    _ledgers: dict[str, dict[str, str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self.index:
+            for idx, title in enumerate(self.titles):
+                self.index.setdefault(title, idx)
+
+    def get_section(self, title: str) -> str:
+        idx = self.index.get(title)
+        if idx is None:
+            raise ValueError(f"Section not found: {title}")
+        if title == _HISTORY_TITLE:
+            self._flush_history()
+        elif title in self._ledgers:
+            self._flush_ledger(title)
+        return self.bodies[idx]
+
+    def set_section(self, title: str, body: str) -> None:
+        idx = self.index.get(title)
+        if idx is None:
+            raise ValueError(f"Section not found: {title}")
+        self.bodies[idx] = body.strip()
+        if title == _HISTORY_TITLE:
+            self._history = None
+        self._ledgers.pop(title, None)
+
+    def _flush_history(self) -> None:
+        if self._history is not None:
+            self.bodies[self.index[_HISTORY_TITLE]] = "\n".join(self._history)
+
+    def _ledger(self, title: str) -> dict[str, str]:
+        blocks = self._ledgers.get(title)
+        if blocks is None:
+            blocks = self._ledgers[title] = _split_ledger(self.get_section(title))
+        return blocks
+
+    def _flush_ledger(self, title: str) -> None:
+        self.bodies[self.index[title]] = "\n\n".join(self._ledgers[title].values())
+
+    def render(self) -> str:
+        self._flush_history()
+        for title in self._ledgers:
+            self._flush_ledger(title)
+        sections = "\n\n".join(
+            f"## {title}\n{body}" for title, body in zip(self.titles, self.bodies)
+        )
+        if not self.titles:
+            return self.preamble
+        preamble = self.preamble.strip()
+        return (f"{preamble}\n\n" if preamble else "") + sections + "\n"
+
+    def header_field(self, field: str) -> str | None:
+        return _header_field(self.get_section("Header"), field)
+
+    def task_graph_yaml(self) -> str:
+        return _task_graph_yaml(self.get_section("Task Graph (machine-readable)"))
+
+    def update_current_best_answer(self, answer: str) -> None:
+        self.set_section("Current best answer", answer)
+
+    def update_task_graph(self, task_graph: dict[str, Any]) -> None:
+        task_graph_yaml = graph_to_yaml(task_graph)
+        self.set_section(
+            "Task Graph (machine-readable)", f"```yaml\n{task_graph_yaml}\n```"
+        )
+
+    def update_task_board(self, task_graph: dict[str, Any]) -> None:
+        self.set_section("Task Board (human-readable)", render_task_board(task_graph))
+
+    def update_results_ledger(
+        self,
+        task_id: str,
+        title: str,
+        status: str,
+        summary: str,
+        artifacts: list[str],
+        evidence: list[str],
+        issues: list[str] | None = None,
+    ) -> None:
+        self.update_results_ledger_many(
+            [(task_id, title, status, summary, artifacts, evidence, issues)]
+        )
+
+    def update_results_ledger_many(self, entries: list[tuple[Any, ...]]) -> None:
+        blocks = self._ledger("Results ledger")
+        for entry in entries:
+            blocks[entry[0]] = _render_task_result_block(*entry)
+
+    def update_evidence_ledger(self, task_id: str, entries: list[str]) -> None:
+        self.update_evidence_ledger_many([(task_id, entries)])
+
+    def update_evidence_ledger_many(
+        self, entries: list[tuple[str, list[str]]]
+    ) -> None:
+        blocks = self._ledger("Evidence / citations ledger")
+        for task_id, lines in entries:
+            blocks[task_id] = _render_evidence_block(task_id, lines)
+
+    def update_verifier_status(
+        self,
+        stage_id: int | None,
+        verdict: str,
+        issues: list[str],
+        final_verdict: str | None = None,
+    ) -> None:
+        lines = []
+        if stage_id is not None:
+            lines.append(f"- stage_verifier: {verdict} (stage {stage_id})")
+        else:
+            lines.append("- stage_verifier: not_run")
+        if final_verdict:
+            lines.append(f"- final_verifier: {final_verdict}")
+        else:
+            lines.append("- final_verifier: not_run")
+        if issues:
+            lines.append("")
+            lines.append("### Issues")
+            lines.extend(f"- {issue}" for issue in issues)
+        self.set_section("Verifier status", "\n".join(lines))
+
+    def update_final_verifier(self, final_verdict: str) -> None:
+        lines = self.get_section("Verifier status").splitlines()
+        updated = []
+        found = False
+        for line in lines:
+            if line.startswith("- final_verifier:"):
+                updated.append(f"- final_verifier: {final_verdict}")
+                found = True
+            else:
+                updated.append(line)
+        if not found:
+            updated.append(f"- final_verifier: {final_verdict}")
+        self.set_section("Verifier status", "\n".join(updated))
+
+    def append_history(self, entry: str, now: datetime | None = None) -> None:
+        if self._history is None:
+            self._history = self.get_section(_HISTORY_TITLE).splitlines()
+        self._history.append(f"- {_now_iso(now)}: {entry}".rstrip())
+
+    def touch_last_updated(self, now: datetime | None = None) -> None:
+        timestamp = _now_iso(now)
+        updated_lines = []
+        for line in self.get_section("Header").splitlines():
+            if line.startswith("- last_updated:"):
+                updated_lines.append(f"- last_updated: {timestamp}")
+            else:
+                updated_lines.append(line)
+        self.set_section("Header", "\n".join(updated_lines))
+
+
+def parse_state_doc(text: str) -> StateDocModel:
+    # Sections start at "## <known title>\n" on its own line; any other "## "
+    # line stays part of the body it appears in.
+    parts = text.split("\n## ")
+    preamble = parts[0]
+    if preamble.startswith("## "):
+        parts[0] = preamble[3:]
+        preamble = ""
+    else:
+        parts = parts[1:]
+    titles: list[str] = []
+    bodies: list[str] = []
+    last = len(parts) - 1
+    for idx, part in enumerate(parts):
+        title, sep, body = part.partition("\n")
+        # No newline before the next split point means an empty section.
+        if (sep or idx < last) and title in _SECTION_TITLE_SET:
+            titles.append(title)
+            bodies.append(body)
+        elif bodies:
+            bodies[-1] += f"\n## {part}"
+        else:
+            preamble += f"\n## {part}"
+    if not titles:
+        return StateDocModel(text, [], [])
+    return StateDocModel(preamble, titles, [body.strip() for body in bodies])
+
+
+def render_state_doc_from_model(model: StateDocModel) -> str:
+    return model.render()
+
+
+def _apply(text: str, update: Any, *args: Any) -> str:
+    # String-level updates parse a private model per call, so concurrent callers
+    # never share one. Chained updates should hold a StateDocModel instead.
+    model = parse_state_doc(text)
+    update(model, *args)
+    return model.render()
 
 
 def update_current_best_answer(text: str, answer: str) -> str:
-    return replace_section(text, "Current best answer", answer.strip())
+    return _apply(text, StateDocModel.update_current_best_answer, answer)
 
 
 def extract_header_field(text: str, field: str) -> str | None:
-    header = extract_section(text, "Header")
+    return _header_field(extract_section(text, "Header"), field)
+
+
+def _header_field(header: str, field: str) -> str | None:
     lines = header.splitlines()
     for idx, line in enumerate(lines):
         if not line.startswith(f"- {field}:"):
@@ -194,7 +463,7 @@ def extract_header_field(text: str, field: str) -> str | None:
         if idx + 1 >= len(lines):
             return ""
         fence_line = lines[idx + 1].strip()
-        fence_match = re.match(r"^(`{3,})", fence_line)
+        fence_match = _FENCE_RE.match(fence_line)
         if not fence_match:
             return ""
         fence = fence_match.group(1)
@@ -208,40 +477,27 @@ def extract_header_field(text: str, field: str) -> str | None:
 
 
 def extract_task_graph_yaml(text: str) -> str:
-    section = extract_section(text, "Task Graph (machine-readable)")
-    match = re.search(r"```yaml\n(.*?)\n```", section, re.S)
+    return _task_graph_yaml(extract_section(text, "Task Graph (machine-readable)"))
+
+
+def _task_graph_yaml(section: str) -> str:
+    match = _YAML_BLOCK_RE.search(section)
     if not match:
         raise ValueError("Task graph YAML block not found.")
     return match.group(1).strip()
 
 
 def extract_latest_human_review_awaitable(text: str) -> str | None:
-    history = extract_section(text, "History log")
-    last: str | None = None
-    for line in history.splitlines():
-        match = re.search(r"awaiting human review: (\S+)", line)
-        if match:
-            last = match.group(1)
-    return last
+    matches = _AWAITING_RE.findall(extract_section(text, _HISTORY_TITLE))
+    return matches[-1] if matches else None
 
 
 def update_task_graph(text: str, task_graph: dict[str, Any]) -> str:
-    task_graph_yaml = graph_to_yaml(task_graph)
-    new_body = f"```yaml\n{task_graph_yaml}\n```"
-    return replace_section(text, "Task Graph (machine-readable)", new_body)
+    return _apply(text, StateDocModel.update_task_graph, task_graph)
 
 
 def update_task_board(text: str, task_graph: dict[str, Any]) -> str:
-    board = render_task_board(task_graph)
-    return replace_section(text, "Task Board (human-readable)", board)
-
-
-def _replace_subsection(body: str, header: str, new_block: str) -> str:
-    pattern = rf"^### {re.escape(header)}.*?(?=^### |\Z)"
-    match = re.search(pattern, body, re.S | re.M)
-    if match:
-        return body[: match.start()] + new_block + "\n\n" + body[match.end() :]
-    return body.rstrip() + "\n\n" + new_block + "\n"
+    return _apply(text, StateDocModel.update_task_board, task_graph)
 
 
 def update_results_ledger(
@@ -254,21 +510,33 @@ def update_results_ledger(
     evidence: list[str],
     issues: list[str] | None = None,
 ) -> str:
-    ledger = extract_section(text, "Results ledger")
-    block = _render_task_result_block(
-        task_id, title, status, summary, artifacts, evidence, issues
+    return _apply(
+        text,
+        StateDocModel.update_results_ledger,
+        task_id,
+        title,
+        status,
+        summary,
+        artifacts,
+        evidence,
+        issues,
     )
-    updated = _replace_subsection(ledger, task_id, block)
-    return replace_section(text, "Results ledger", updated.strip())
+
+
+def update_results_ledger_many(text: str, entries: list[tuple[Any, ...]]) -> str:
+    return _apply(text, StateDocModel.update_results_ledger_many, entries)
 
 
 def update_evidence_ledger(
     text: str, task_id: str, entries: list[str]
 ) -> str:
-    ledger = extract_section(text, "Evidence / citations ledger")
-    block = _render_evidence_block(task_id, entries)
-    updated = _replace_subsection(ledger, task_id, block)
-    return replace_section(text, "Evidence / citations ledger", updated.strip())
+    return _apply(text, StateDocModel.update_evidence_ledger, task_id, entries)
+
+
+def update_evidence_ledger_many(
+    text: str, entries: list[tuple[str, list[str]]]
+) -> str:
+    return _apply(text, StateDocModel.update_evidence_ledger_many, entries)
 
 
 def update_verifier_status(
@@ -278,36 +546,18 @@ def update_verifier_status(
     issues: list[str],
     final_verdict: str | None = None,
 ) -> str:
-    lines = []
-    if stage_id is not None:
-        lines.append(f"- stage_verifier: {verdict} (stage {stage_id})")
-    else:
-        lines.append("- stage_verifier: not_run")
-    if final_verdict:
-        lines.append(f"- final_verifier: {final_verdict}")
-    else:
-        lines.append("- final_verifier: not_run")
-    if issues:
-        lines.append("")
-        lines.append("### Issues")
-        lines.extend([f"- {issue}" for issue in issues])
-    return replace_section(text, "Verifier status", "\n".join(lines))
+    return _apply(
+        text,
+        StateDocModel.update_verifier_status,
+        stage_id,
+        verdict,
+        issues,
+        final_verdict,
+    )
 
 
 def update_final_verifier(text: str, final_verdict: str) -> str:
-    verifier = extract_section(text, "Verifier status")
-    lines = verifier.splitlines()
-    updated = []
-    found = False
-    for line in lines:
-        if line.startswith("- final_verifier:"):
-            updated.append(f"- final_verifier: {final_verdict}")
-            found = True
-        else:
-            updated.append(line)
-    if not found:
-        updated.append(f"- final_verifier: {final_verdict}")
-    return replace_section(text, "Verifier status", "\n".join(updated).strip())
+    return _apply(text, StateDocModel.update_final_verifier, final_verdict)
 
 
 def render_final_output(question: str, summary: str, final_report: str) -> str:
@@ -322,19 +572,9 @@ def render_final_output(question: str, summary: str, final_report: str) -> str:
     )
 
 
-def append_history(text: str, entry: str) -> str:
-    history = extract_section(text, "History log")
-    updated = history.rstrip() + f"\n- {_now_iso()}: {entry}"
-    return replace_section(text, "History log", updated.strip())
+def append_history(text: str, entry: str, now: datetime | None = None) -> str:
+    return _apply(text, StateDocModel.append_history, entry, now)
 
 
-def touch_last_updated(text: str) -> str:
-    header = extract_section(text, "Header")
-    lines = header.splitlines()
-    updated_lines = []
-    for line in lines:
-        if line.startswith("- last_updated:"):
-            updated_lines.append(f"- last_updated: {_now_iso()}")
-        else:
-            updated_lines.append(line)
-    return replace_section(text, "Header", "\n".join(updated_lines).strip())
+def touch_last_updated(text: str, now: datetime | None = None) -> str:
+    return _apply(text, StateDocModel.touch_last_updated, now)
@@ -4,10 +4,36 @@ import sqlite3
 from pathlib import Path
 from typing import Any
 
+# One connection per database file for the life of the process. Only per-connection
+# pragmas are set; the on-disk journal mode of the tracked database is left alone.
+_CONNS: dict[Path, sqlite3.Connection] = {}
+_SCHEMA_READY: set[str] = set()
+
+
+def _get_conn(db_path: Path) -> sqlite3.Connection:
+    conn = _CONNS.get(db_path)
+    if conn is None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.row_factory = sqlite3.Row
+        _CONNS[db_path] = conn
+    key = str(db_path)
+    if key not in _SCHEMA_READY:
+        _create_schema(conn)
+        _SCHEMA_READY.add(key)
+    return conn
+
 
 def ensure_db(db_path: Path) -> None:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
+    if str(db_path) in _SCHEMA_READY:
+        return
+    _get_conn(db_path)
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    with conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS papers (
@@ -32,26 +58,31 @@ def ensure_db(db_path: Path) -> None:
             )
             """
         )
-        _ensure_column(conn, "papers", "openai_file_id", "TEXT")
-        _ensure_column(conn, "papers", "vector_store_id", "TEXT")
-        _ensure_column(conn, "papers", "vector_store_file_id", "TEXT")
-        conn.commit()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_papers_run ON papers(run_id)")
+        _ensure_columns(
+            conn,
+            "papers",
+            {
+                "openai_file_id": "TEXT",
+                "vector_store_id": "TEXT",
+                "vector_store_file_id": "TEXT",
+            },
+        )
 
 
-def _ensure_column(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
+def _ensure_columns(conn: sqlite3.Connection, table: str, columns: dict[str, str]) -> None:
     existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
-    if column not in existing:
-        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+    for column, col_type in columns.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
 
 
 def record_run(db_path: Path, run_id: str, question: str, created_at: str) -> None:
-    ensure_db(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with _get_conn(db_path) as conn:
         conn.execute(
             "INSERT OR REPLACE INTO runs (run_id, question, created_at) VALUES (?, ?, ?)",
             (run_id, question, created_at),
         )
-        conn.commit()
 
 
 def record_paper(
@@ -66,14 +97,9 @@ def record_paper(
     vector_store_id: str | None = None,
     vector_store_file_id: str | None = None,
 ) -> None:
-    ensure_db(db_path)
-    with sqlite3.connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO papers
-            (id, run_id, source_path, stored_path, sha256, added_at, openai_file_id, vector_store_id, vector_store_file_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    record_papers(
+        db_path,
+        [
             (
                 paper_id,
                 run_id,
@@ -84,28 +110,39 @@ def record_paper(
                 openai_file_id,
                 vector_store_id,
                 vector_store_file_id,
-            ),
+            )
+        ],
+    )
+
+
+def record_papers(db_path: Path, rows: list[tuple[Any, ...]]) -> None:
+    if not rows:
+        return
+    with _get_conn(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO papers
+            (id, run_id, source_path, stored_path, sha256, added_at, openai_file_id, vector_store_id, vector_store_file_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+
+def update_paper_uploads(db_path: Path, rows: list[tuple[Any, ...]]) -> None:
+    # rows are (openai_file_id, vector_store_file_id, paper_id)
+    if not rows:
+        return
+    with _get_conn(db_path) as conn:
+        conn.executemany(
+            "UPDATE papers SET openai_file_id = ?, vector_store_file_id = ? WHERE id = ?",
+            rows,
         )
-        conn.commit()
 
 
 def list_papers(db_path: Path, run_id: str) -> list[dict[str, Any]]:
-    ensure_db(db_path)
-    with sqlite3.connect(db_path) as conn:
-        rows = conn.execute(
-            "SELECT id, source_path, stored_path, sha256, added_at, openai_file_id, vector_store_id, vector_store_file_id FROM papers WHERE run_id = ?",
-            (run_id,),
-        ).fetchall()
-    return [
-        {
-            "id": row[0],
-            "source_path": row[1],
-            "stored_path": row[2],
-            "sha256": row[3],
-            "added_at": row[4],
-            "openai_file_id": row[5],
-            "vector_store_id": row[6],
-            "vector_store_file_id": row[7],
-        }
-        for row in rows
-    ]
+    rows = _get_conn(db_path).execute(
+        "SELECT id, source_path, stored_path, sha256, added_at, openai_file_id, vector_store_id, vector_store_file_id FROM papers WHERE run_id = ?",
+        (run_id,),
+    ).fetchall()
+    return [dict(row) for row in rows]
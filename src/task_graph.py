@@ -4,6 +4,15 @@ from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _Dumper
+    from yaml import SafeLoader as _Loader
+
+_TERMINAL_STATUSES = frozenset({"done", "skipped"})
+
 VALID_STATUSES = {
     "todo",
     "running",
@@ -163,6 +172,42 @@ def iter_tasks(graph: dict[str, Any]) -> list[dict[str, Any]]:
     return tasks
 
 
+class TaskGraphView:
+    """Task and stage indexes by task id over one graph.
+
+    Build it once per step and pass it to the lookups that step makes. The
+    indexes are not refreshed on their own: record tasks added to the graph
+    with add_tasks, and build a new view after removing or renaming tasks.
+    """
+
+    def __init__(self, graph: dict[str, Any]) -> None:
+        self.task_by_id: dict[str, dict[str, Any]] = {}
+        self.stage_by_task_id: dict[str, dict[str, Any]] = {}
+        for stage in graph.get("stages", []):
+            self.add_tasks(stage, stage.get("tasks", []))
+
+    def add_tasks(self, stage: dict[str, Any], tasks: list[dict[str, Any]]) -> None:
+        for task in tasks:
+            task_id = task.get("id")
+            if task_id not in self.task_by_id:
+                self.task_by_id[task_id] = task
+                self.stage_by_task_id[task_id] = stage
+
+    def find_task(self, task_id: str) -> dict[str, Any] | None:
+        return self.task_by_id.get(task_id)
+
+    def stage_for_task(self, task_id: str) -> dict[str, Any] | None:
+        return self.stage_by_task_id.get(task_id)
+
+    def dependencies_satisfied(self, task: dict[str, Any]) -> bool:
+        task_by_id = self.task_by_id
+        for dep in task.get("depends_on", []):
+            dep_task = task_by_id.get(dep)
+            if dep_task is None or dep_task.get("status") not in _TERMINAL_STATUSES:
+                return False
+        return True
+
+
 def find_task(graph: dict[str, Any], task_id: str) -> dict[str, Any] | None:
     for task in iter_tasks(graph):
         if task.get("id") == task_id:
@@ -181,7 +226,7 @@ def stage_for_task(graph: dict[str, Any], task_id: str) -> dict[str, Any] | None
 def current_stage(graph: dict[str, Any]) -> dict[str, Any] | None:
     for stage in graph.get("stages", []):
         tasks = stage.get("tasks", [])
-        if any(task.get("status") not in {"done", "skipped"} for task in tasks):
+        if any(task.get("status") not in _TERMINAL_STATUSES for task in tasks):
             return stage
     return None
 
@@ -191,23 +236,33 @@ def dependencies_satisfied(graph: dict[str, Any], task: dict[str, Any]) -> bool:
         dep_task = find_task(graph, dep)
         if dep_task is None:
             return False
-        if dep_task.get("status") not in {"done", "skipped"}:
+        if dep_task.get("status") not in _TERMINAL_STATUSES:
             return False
     return True
 
 
-def runnable_tasks(graph: dict[str, Any], stage: dict[str, Any]) -> list[dict[str, Any]]:
-    runnable: list[dict[str, Any]] = []
-    for task in stage.get("tasks", []):
-        if task.get("status") == "todo" and dependencies_satisfied(graph, task):
-            runnable.append(task)
-    return runnable
+def runnable_tasks(
+    graph: dict[str, Any],
+    stage: dict[str, Any],
+    view: TaskGraphView | None = None,
+) -> list[dict[str, Any]]:
+    view = view or TaskGraphView(graph)
+    return [
+        task
+        for task in stage.get("tasks", [])
+        if task.get("status") == "todo" and view.dependencies_satisfied(task)
+    ]
 
 
 def set_task_status(
-    graph: dict[str, Any], task_id: str, status: str, **kwargs: Any
+    graph: dict[str, Any],
+    task_id: str,
+    status: str,
+    *,
+    view: TaskGraphView | None = None,
+    **kwargs: Any,
 ) -> None:
-    task = find_task(graph, task_id)
+    task = view.find_task(task_id) if view is not None else find_task(graph, task_id)
     if task is None:
         raise ValueError(f"Unknown task id: {task_id}")
     if status not in VALID_STATUSES:
@@ -218,7 +273,7 @@ def set_task_status(
 
 
 def stage_complete(stage: dict[str, Any]) -> bool:
-    return all(task.get("status") in {"done", "skipped"} for task in stage.get("tasks", []))
+    return all(task.get("status") in _TERMINAL_STATUSES for task in stage.get("tasks", []))
 
 
 def next_subtask_index(stage: dict[str, Any]) -> int:
@@ -270,12 +325,12 @@ def add_followup_tasks(
 
 
 def graph_to_yaml(graph: dict[str, Any]) -> str:
-    body = yaml.safe_dump(graph, sort_keys=False).strip()
+    body = yaml.dump(graph, sort_keys=False, Dumper=_Dumper).strip()
     return f"# TASK_GRAPH_V2\n{body}"
 
 
 def yaml_to_graph(yaml_text: str) -> dict[str, Any]:
-    payload = yaml.safe_load(yaml_text)
+    payload = yaml.load(yaml_text, Loader=_Loader)
     if not isinstance(payload, dict):
         raise ValueError("Task graph YAML must be a mapping.")
     return payload
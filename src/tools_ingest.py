@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -9,15 +11,32 @@ from typing import Any
 from openai import OpenAI
 
 from .paths import papers_root, db_path
-from .storage import record_paper
+from .storage import record_papers, update_paper_uploads
+
+_UPLOAD_WORKERS = 8
+_COPY_CHUNK = 1 << 20
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _sha256_bytes(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+def _copy_and_hash(src: Path, root: Path) -> tuple[str, Path]:
+    # Hash while copying; the stored name depends on the digest, so copy to a temp name first.
+    digest = hashlib.sha256()
+    tmp = root / f".{src.name}.{os.getpid()}.part"
+    try:
+        with src.open("rb", buffering=0) as fin, tmp.open("wb") as fout:
+            for chunk in iter(lambda: fin.read(_COPY_CHUNK), b""):
+                digest.update(chunk)
+                fout.write(chunk)
+        sha = digest.hexdigest()
+        dest = root / f"{sha[:8]}_{src.name}"
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return sha, dest
 
 
 def _openai_client_from_config(config: dict[str, Any]) -> OpenAI | None:
@@ -29,9 +48,25 @@ def _openai_client_from_config(config: dict[str, Any]) -> OpenAI | None:
     project = default_openai.get("project") or None
     if not api_key and not base_url and not organization and not project:
         # Allow default OpenAI client behavior (environment variables).
-        if os.getenv("OPENAI_API_KEY"):
-            return OpenAI()
-        return None
+        if not os.getenv("OPENAI_API_KEY"):
+            return None
+    # Resolve the environment fallbacks here so they are part of the cache key.
+    return _make_client(
+        api_key or os.getenv("OPENAI_API_KEY"),
+        base_url or os.getenv("OPENAI_BASE_URL"),
+        organization or os.getenv("OPENAI_ORG_ID"),
+        project or os.getenv("OPENAI_PROJECT_ID"),
+    )
+
+
+# Reused across ingest_docs calls so uploads keep the client's connection pool.
+@functools.lru_cache(maxsize=4)
+def _make_client(
+    api_key: str | None,
+    base_url: str | None,
+    organization: str | None,
+    project: str | None,
+) -> OpenAI:
     return OpenAI(
         api_key=api_key,
         base_url=base_url,
@@ -51,12 +86,52 @@ def _attach_to_vector_store(
     return getattr(result, "id", None)
 
 
+def _upload_one(client: OpenAI, vector_store_id: str, record: dict[str, Any]) -> None:
+    # Ids are stored on the record as soon as they exist, so a failed attach
+    # still leaves the uploaded file id recorded.
+    with open(record["stored_path"], "rb") as file_obj:
+        file_result = client.files.create(file=file_obj, purpose="assistants")
+    openai_file_id = getattr(file_result, "id", None)
+    record["openai_file_id"] = openai_file_id
+    if openai_file_id:
+        record["vector_store_file_id"] = _attach_to_vector_store(
+            client, vector_store_id, openai_file_id
+        )
+
+
+def _upload_all(
+    client: OpenAI, vector_store_id: str, records: list[dict[str, Any]]
+) -> None:
+    # Uploads and vector store polling are network-bound and independent per doc.
+    first_error: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=min(_UPLOAD_WORKERS, len(records))) as executor:
+        futures = [
+            executor.submit(_upload_one, client, vector_store_id, record)
+            for record in records
+        ]
+        for future in as_completed(futures):
+            exc = future.exception()
+            if exc is not None and first_error is None:
+                first_error = exc
+    update_paper_uploads(
+        db_path(),
+        [
+            (record["openai_file_id"], record["vector_store_file_id"], record["id"])
+            for record in records
+            if record["openai_file_id"]
+        ],
+    )
+    if first_error is not None:
+        raise first_error
+
+
 def ingest_docs(
     run_id: str,
     doc_paths: list[str],
     config: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
-    papers_root().mkdir(parents=True, exist_ok=True)
+    root = papers_root()
+    root.mkdir(parents=True, exist_ok=True)
     results: list[dict[str, Any]] = []
     vector_store_id = ""
     client: OpenAI | None = None
@@ -73,45 +148,38 @@ def ingest_docs(
         src = Path(doc_path).expanduser().resolve()
         if not src.exists():
             raise FileNotFoundError(f"Doc not found: {src}")
-        data = src.read_bytes()
-        sha = _sha256_bytes(data)
-        stored_name = f"{sha[:8]}_{src.name}"
-        dest = papers_root() / stored_name
-        dest.write_bytes(data)
-        paper_id = sha[:16]
-        added_at = _now_iso()
-        openai_file_id = None
-        vector_store_file_id = None
-        if client and vector_store_id:
-            with src.open("rb") as file_obj:
-                file_result = client.files.create(file=file_obj, purpose="assistants")
-            openai_file_id = getattr(file_result, "id", None)
-            if openai_file_id:
-                vector_store_file_id = _attach_to_vector_store(
-                    client, vector_store_id, openai_file_id
-                )
-        record_paper(
-            db_path=db_path(),
-            paper_id=paper_id,
-            run_id=run_id,
-            source_path=str(src),
-            stored_path=str(dest),
-            sha256=sha,
-            added_at=added_at,
-            openai_file_id=openai_file_id,
-            vector_store_id=vector_store_id or None,
-            vector_store_file_id=vector_store_file_id,
-        )
+        sha, dest = _copy_and_hash(src, root)
         results.append(
             {
-                "id": paper_id,
+                "id": sha[:16],
                 "source_path": str(src),
                 "stored_path": str(dest),
                 "sha256": sha,
-                "added_at": added_at,
-                "openai_file_id": openai_file_id,
+                "added_at": _now_iso(),
+                "openai_file_id": None,
                 "vector_store_id": vector_store_id or None,
-                "vector_store_file_id": vector_store_file_id,
+                "vector_store_file_id": None,
             }
         )
+    # Local rows go in first so a failed upload can't leave copied (or already
+    # uploaded) docs unrecorded.
+    record_papers(
+        db_path(),
+        [
+            (
+                record["id"],
+                run_id,
+                record["source_path"],
+                record["stored_path"],
+                record["sha256"],
+                record["added_at"],
+                record["openai_file_id"],
+                record["vector_store_id"],
+                record["vector_store_file_id"],
+            )
+            for record in results
+        ],
+    )
+    if client and vector_store_id and results:
+        _upload_all(client, vector_store_id, results)
     return results
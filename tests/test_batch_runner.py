@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from agents import Agent, AgentOutputSchema, ModelSettings
+from openai.types.shared import Reasoning
+
+from src.agents import openai_client_for, reset_provider_cache
+from src.batch_runner import BatchRunner, _parse_entry, _settings_body
+from src.models import TaskResult, VerifierResult
+
+
+def _ok_entry(text: str) -> dict:
+    return {
+        "custom_id": "req-1",
+        "response": {
+            "status_code": 200,
+            "body": {
+                "output": [
+                    {"type": "reasoning", "content": None},
+                    {"type": "message", "content": [{"type": "output_text", "text": text}]},
+                ]
+            },
+        },
+        "error": None,
+    }
+
+
+def test_settings_body_maps_set_fields_only() -> None:
+    settings = ModelSettings(
+        temperature=0.2,
+        max_tokens=512,
+        reasoning=Reasoning(effort="high"),
+        top_logprobs=3,
+        response_include=["file_search_call.results"],
+        extra_args={"prompt_cache_key": "run:1"},
+    )
+    assert _settings_body(settings) == {
+        "temperature": 0.2,
+        "max_output_tokens": 512,
+        "reasoning": {"effort": "high"},
+        "top_logprobs": 3,
+        "include": ["file_search_call.results", "message.output_text.logprobs"],
+        "prompt_cache_key": "run:1",
+    }
+
+
+def test_settings_body_empty_for_default_settings() -> None:
+    assert _settings_body(ModelSettings()) == {}
+
+
+def test_request_line_targets_responses_with_schema() -> None:
+    agent = Agent(name="Verifier", instructions="Check.", model="gpt-5", output_type=VerifierResult)
+    line = BatchRunner({})._request_line(
+        "req-1", agent, {"task_id": "1.2"}, ModelSettings(temperature=0.0)
+    )
+    assert line["custom_id"] == "req-1"
+    assert line["url"] == "/v1/responses"
+    body = line["body"]
+    assert body["model"] == "gpt-5"
+    assert body["input"] == json.dumps({"task_id": "1.2"})
+    assert body["temperature"] == 0.0
+
+
+def test_request_line_uses_the_strict_runner_schema() -> None:
+    agent = Agent(name="Verifier", instructions="Check.", model="gpt-5", output_type=VerifierResult)
+    text_format = BatchRunner({})._request_line("req-1", agent, "x", ModelSettings())["body"][
+        "text"
+    ]["format"]
+    assert text_format == {
+        "type": "json_schema",
+        "name": "final_output",
+        "schema": AgentOutputSchema(VerifierResult).json_schema(),
+        "strict": True,
+    }
+    assert text_format["schema"]["additionalProperties"] is False
+
+
+def test_request_line_keeps_an_explicit_non_strict_schema() -> None:
+    output_schema = AgentOutputSchema(TaskResult, strict_json_schema=False)
+    agent = Agent(name="PaperReader", instructions="Read.", model="gpt-5", output_type=output_schema)
+    text_format = BatchRunner({})._request_line("req-1", agent, "x", ModelSettings())["body"][
+        "text"
+    ]["format"]
+    assert text_format["schema"] == output_schema.json_schema()
+    assert text_format["strict"] is False
+
+
+def test_parse_entry_returns_validated_output() -> None:
+    result = _parse_entry(
+        _ok_entry(json.dumps({"summary": "done", "follow_ups": ["check limits"]})),
+        AgentOutputSchema(TaskResult, strict_json_schema=False),
+        "completed",
+    )
+    assert result.summary == "done"
+    assert result.follow_ups == ["check limits"]
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        None,
+        {"custom_id": "req-1", "response": None, "error": {"message": "boom"}},
+        {"custom_id": "req-1", "response": {"status_code": 400, "body": {}}, "error": None},
+        {"custom_id": "req-1", "response": {"status_code": 200, "body": {"output": []}}},
+    ],
+)
+def test_parse_entry_rejects_missing_or_failed_results(entry) -> None:
+    with pytest.raises(RuntimeError):
+        _parse_entry(entry, AgentOutputSchema(VerifierResult), "expired")
+
+
+def test_client_comes_from_the_agent_provider_config() -> None:
+    reset_provider_cache()
+    config = {
+        "providers": {
+            "default": {"openai": {"api_key": "sk-default"}},
+            "per_agent": {
+                "paper_reader": {"openai": {"base_url": "https://proxy.example/v1"}}
+            },
+        }
+    }
+    agent = Agent(name="PaperReader", instructions="Read.", output_type=TaskResult)
+    client = BatchRunner(config)._client_for(agent)
+    assert client is openai_client_for("paper_reader", config)
+    assert str(client.base_url).startswith("https://proxy.example/v1")
+    assert client.api_key == "sk-default"
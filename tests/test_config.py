@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+
+from src.config import invalidate_config, load_config, save_config
+
+
+def test_sidecar_ignored_for_yaml_restored_with_older_mtime(tmp_path) -> None:
+    config_path = tmp_path / "agents.yaml"
+    save_config(config_path, {"models": {"default": "new"}})
+    assert config_path.with_suffix(".yaml.cache.json").exists()
+    stat = config_path.stat()
+
+    config_path.write_text("models:\n  default: old\n")
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+    invalidate_config(config_path)
+    assert load_config(config_path)["models"]["default"] == "old"
+
+    invalidate_config(config_path)
+    assert load_config(config_path)["models"]["default"] == "old"
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import os
+
+import pytest
+
+from src import orchestrator
+from src.orchestrator import (
+    StepOutcome,
+    _agents_stamp_current,
+    _cached_idle_outcome,
+    _get_cached_agents,
+    _prompt_cache_config,
+    _write_status,
+)
+
+
+def _config(**openai: object) -> dict:
+    return {"providers": {"default": {"openai": {"api_key": "", "base_url": "", **openai}}}}
+
+
+@pytest.fixture(autouse=True)
+def _no_base_url_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+
+
+def test_prompt_cache_key_sent_to_openai_responses() -> None:
+    run_config = _prompt_cache_config("run_1", 2, "paper_reader", _config())
+    assert run_config is not None
+    assert run_config.model_settings.extra_args == {"prompt_cache_key": "run_1:2"}
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        _config(base_url="http://localhost:8000/v1"),
+        _config(use_responses=False),
+        {
+            "providers": {
+                "default": {"openai": {}},
+                "per_agent": {"paper_reader": {"openai": {"base_url": "http://vllm/v1"}}},
+            }
+        },
+    ],
+)
+def test_prompt_cache_key_left_out_for_other_providers(config: dict) -> None:
+    assert _prompt_cache_config("run_1", 2, "paper_reader", config) is None
+
+
+def test_prompt_cache_key_left_out_for_env_base_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:8000/v1")
+    assert _prompt_cache_config("run_1", 2, "paper_reader", _config()) is None
+
+
+def test_cached_agents_follow_env_changes(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    config_path = tmp_path / "agents.yaml"
+    config_path.write_text(
+        Path("configs/agents.yaml").read_text().replace('api_key: ""', 'api_key: "${TEST_KEY}"', 1)
+    )
+    monkeypatch.setenv("TEST_KEY", "sk-one")
+    config, agents, stamp = _get_cached_agents(str(config_path))
+    assert config["providers"]["default"]["openai"]["api_key"] == "sk-one"
+    assert _get_cached_agents(str(config_path))[1] is agents
+
+    monkeypatch.setenv("TEST_KEY", "sk-two")
+    assert not _agents_stamp_current(config_path, config, stamp)
+    config, rebuilt, _ = _get_cached_agents(str(config_path))
+    assert rebuilt is not agents
+    assert config["providers"]["default"]["openai"]["api_key"] == "sk-two"
+    assert rebuilt.config["providers"]["default"]["openai"]["api_key"] == "sk-two"
+
+
+def test_idle_status_ignored_after_same_size_same_mtime_edit(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(orchestrator, "run_status_path", lambda run_id: tmp_path / "status.json")
+    doc_path = tmp_path / "RESEARCH_STATE.md"
+    doc_path.write_text("answer: aaaa\n")
+    _write_status("run_1", doc_path, StepOutcome("run_1", 1, [], None, "no_runnable_tasks"))
+    assert _cached_idle_outcome("run_1", doc_path) is not None
+
+    stat = doc_path.stat()
+    doc_path.write_text("answer: bbbb\n")
+    os.utime(doc_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _cached_idle_outcome("run_1", doc_path) is None
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from src.review import _task_block_pattern
+
+
+def test_task_block_pattern_does_not_match_a_child_task() -> None:
+    ledger = "### 1.1.2 Child\n- child\n\n### 1.1\n- parent\n\n### 1.10 Other\n- other\n"
+    match = _task_block_pattern("1.1").search(ledger)
+    assert match is not None
+    assert match.group(0).strip() == "### 1.1\n- parent"
+    assert _task_block_pattern("1.1.2").search(ledger).group(0).startswith("### 1.1.2 Child")
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.state_doc import extract_section, render_state_doc, replace_section
+from src.task_graph import default_task_graph
+
+
+def _doc(question: str) -> str:
+    return render_state_doc(
+        run_id=f"run_{question}",
+        question=question,
+        problem_spec_text="spec",
+        config_snapshot="models: {}",
+        task_graph=default_task_graph(),
+    )
+
+
+def test_replace_section_leaves_earlier_text_and_results_alone() -> None:
+    text = _doc("q")
+    first = replace_section(text, "Current best answer", "first")
+    second = replace_section(text, "Current best answer", "second")
+    assert extract_section(text, "Current best answer") != "first"
+    assert extract_section(first, "Current best answer") == "first"
+    assert extract_section(second, "Current best answer") == "second"
+
+
+def test_replace_section_is_safe_across_threads() -> None:
+    docs = {f"q{idx}": _doc(f"q{idx}") for idx in range(8)}
+
+    def update(question: str) -> tuple[str, str]:
+        text = docs[question]
+        for round_idx in range(50):
+            text = replace_section(text, "Current best answer", f"{question}-{round_idx}")
+        return question, text
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(update, docs))
+    for question, text in results:
+        assert extract_section(text, "Current best answer") == f"{question}-49"
+        assert f"run_{question}" in extract_section(text, "Header")
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import sqlite3
+
+from src.storage import ensure_db, record_run
+
+
+def test_storage_leaves_the_journal_mode_alone(tmp_path) -> None:
+    db_path = tmp_path / "metadata.sqlite"
+    ensure_db(db_path)
+    record_run(db_path, "run_1", "q", "2026-01-01T00:00:00Z")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        conn.close()
+    assert not (tmp_path / "metadata.sqlite-wal").exists()